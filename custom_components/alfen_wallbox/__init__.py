@@ -96,7 +96,13 @@ async def async_unload_entry(
 
     coordinator = config_entry.runtime_data
     await coordinator.device.logout()
-    return await hass.config_entries.async_unload_platforms(config_entry, PLATFORMS)
+    unload_ok = await hass.config_entries.async_unload_platforms(
+        config_entry, PLATFORMS
+    )
+    if unload_ok:
+        # the entry stays loaded when a platform failed, keep its session then
+        await coordinator.async_shutdown()
+    return unload_ok
 
 
 @callback
@@ -1,27 +1,44 @@
 """Alfen Wallbox API."""
 
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable, Coroutine, Iterable
+from contextlib import asynccontextmanager
 import datetime
 import json
 import logging
 from ssl import SSLContext
-
-from aiohttp import ClientResponse, ClientSession
+from typing import Any, TypeVar
+
+from aiohttp import (
+    ClientError,
+    ClientResponse,
+    ClientResponseError,
+    ClientSession,
+    ClientTimeout,
+)
 
 from .const import (
     ALFEN_PRODUCT_MAP,
     CAT,
     CAT_TRANSACTIONS,
-    CATEGORIES,
+    CATEGORY_PRIORITY,
     CMD,
+    DEFAULT_FETCH_CONCURRENCY,
+    DEFAULT_STALE_AGE,
     DEFAULT_TIMEOUT,
     DISPLAY_NAME_VALUE,
     DOMAIN,
     ID,
+    IDS,
     INFO,
     LICENSES,
+    LIVE_CATEGORIES,
     LOGIN,
     LOGOUT,
+    MAX_URL_LENGTH,
     METHOD_GET,
+    METHOD_POST,
+    MODE_3_STATES_NO_VEHICLE,
     OFFSET,
     PARAM_COMMAND,
     PARAM_DISPLAY_NAME,
@@ -29,14 +46,153 @@ from .const import (
     PARAM_USERNAME,
     PROP,
     PROPERTIES,
+    PROPERTY_HOT,
+    PROPERTY_SLOW,
+    PROPERTY_STATIC,
+    RETRY_ATTEMPTS,
+    RETRY_MIN_TIMEOUT,
+    SESSION_RENEW_FACTOR,
+    SLOW_POLL_ROUNDS,
+    SOCKET_STATE_IDS,
+    STATIC_POLL_ROUNDS,
+    STATUS_AVAILABLE,
     TOTAL,
     VALUE,
 )
+from .retry import AlfenRetryPolicy
+from .store import (
+    AlfenProperty,
+    AlfenPropertyActivity,
+    AlfenPropertyCatalog,
+    AlfenPropertyStore,
+    property_id,
+    property_key,
+)
 
 POST_HEADER_JSON = {"Content-Type": "application/json"}
 
 _LOGGER = logging.getLogger(__name__)
 
+_T = TypeVar("_T")
+
+NUMBER_OF_SOCKETS_KEY = property_key("205E_0")
+LICENSES_KEY = property_key("21A2_0")
+UPTIME_KEY = property_key("2060_0")
+SOCKET_STATE_KEYS = frozenset(
+    property_key(api_param) for ids in SOCKET_STATE_IDS for api_param in ids
+)
+# fetched in every targeted poll, whatever their class
+DEVICE_KEYS = SOCKET_STATE_KEYS | {UPTIME_KEY}
+CATEGORY_RANK = {category: rank for rank, category in enumerate(CATEGORY_PRIORITY)}
+
+
+class AlfenAuthManager:
+    """Serialize the logins of a device and track the lease of the session.
+
+    Requests that get a 401 at the same time share one login, and requests
+    that are sent while a login is in flight wait for it.
+
+    The wallbox ends a session that is not used for a while. The idle timeout
+    is learned from the idle time before a 401, bounded below by the longest
+    idle time after which a request still succeeded. With a known timeout the
+    session can be renewed before it expires, instead of in the next poll.
+    """
+
+    def __init__(self, login: Callable[[], Awaitable[None]]) -> None:
+        """Initialize the auth manager."""
+        self._login = login
+        self._lock = asyncio.Lock()
+        # increased by every login, a 401 on a request that was sent before the
+        # last login does not need a new one
+        self.generation = 0
+        # loop times of the last login and the last successful request
+        self.last_login: float | None = None
+        self.last_success: float | None = None
+        # shortest idle time before a 401, longer than the max idle time
+        self.idle_timeout: float | None = None
+        # longest idle time after which a request succeeded
+        self.max_idle = 0.0
+        self.expiries = 0
+        self.renewals = 0
+
+    async def async_login(self) -> None:
+        """Log in, after the login in flight if there is one."""
+        async with self._lock:
+            await self._async_login()
+
+    async def async_relogin(self, generation: int, sent: float) -> None:
+        """Log in again after a 401, unless that happened since the request.
+
+        The request was sent at the given loop time with the session of the
+        given login generation.
+        """
+        async with self._lock:
+            if generation == self.generation:
+                self._observe_expiry(sent)
+                await self._async_login()
+
+    async def _async_login(self) -> None:
+        """Log in and start a new lease."""
+        await self._login()
+        self.generation += 1
+        self.last_login = self.last_success = asyncio.get_running_loop().time()
+
+    def on_success(self, sent: float) -> None:
+        """Record a request sent at the given loop time, which extends the lease."""
+        if self.last_success is not None:
+            self.max_idle = max(self.max_idle, sent - self.last_success)
+            if self.idle_timeout is not None and self.idle_timeout <= self.max_idle:
+                # the session lasted longer than learned, learn it again and
+                # renew at the max idle time meanwhile
+                self.idle_timeout = None
+            sent = max(sent, self.last_success)
+        self.last_success = sent
+
+    def _observe_expiry(self, sent: float) -> None:
+        """Learn the idle timeout from a 401 on a request sent at the loop time."""
+        if self.last_success is None:
+            return
+        idle = sent - self.last_success
+        # a 401 within a known idle time has another cause, like a login of
+        # another client
+        if idle > self.max_idle:
+            self.expiries += 1
+            self.idle_timeout = (
+                idle if self.idle_timeout is None else min(self.idle_timeout, idle)
+            )
+
+    def end_lease(self) -> None:
+        """Forget the lease of a session that was ended by a logout."""
+        self.last_success = None
+
+    def get_renew_delay(self) -> float | None:
+        """Return the seconds until the session should be renewed.
+
+        None until the session expired for being idle once.
+        """
+        if not self.expiries or self.last_success is None:
+            return None
+        lease = self.max_idle
+        if self.idle_timeout is not None:
+            lease = max(lease, self.idle_timeout * SESSION_RENEW_FACTOR)
+        return max(0.0, self.last_success + lease - asyncio.get_running_loop().time())
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the state of the session in a JSON serializable format."""
+        return {
+            "logins": self.generation,
+            "expiries": self.expiries,
+            "renewals": self.renewals,
+            "idle_timeout": self.idle_timeout,
+            "max_idle": round(self.max_idle, 1),
+        }
+
+    async def async_wait(self) -> None:
+        """Wait for the login in flight."""
+        if self._lock.locked():
+            async with self._lock:
+                pass
+
 
 class AlfenDevice:
     """Alfen Device."""
@@ -50,31 +206,85 @@ class AlfenDevice:
         password: str,
         category_options: list,
         ssl: SSLContext,
+        fetch_concurrency: int = DEFAULT_FETCH_CONCURRENCY,
+        stale_age: int = DEFAULT_STALE_AGE,
+        timeout: float = DEFAULT_TIMEOUT,
     ) -> None:
         """Init."""
 
         self.host = host
         self.name = name
-        self._session = session
+        self.session = session
         self.username = username
         self.category_options = category_options
+        self.fetch_concurrency = fetch_concurrency
+        self.stale_age = stale_age
+        # log in for every poll and log out after it
+        self.yield_session = False
+        # polls and writes take turns on the session in yield mode
+        self._yield_lock = asyncio.Lock()
+        self.retry_policy = AlfenRetryPolicy()
+        # seconds a poll may take, categories that are not fetched by then wait
+        # for the next poll
+        self.update_budget = timeout
+        self.set_timeout(timeout)
+        self._fetch_semaphore = asyncio.Semaphore(fetch_concurrency)
+        # keys of the properties used by the entities, None to fetch whole categories
+        self.fetch_ids: set[int] | None = None
+        self._fetch_plans: dict[
+            tuple[tuple[str, ...], bool], list[tuple[str, frozenset[str]]]
+        ] = {}
+        self._fetch_plans_version = 0
+        self._planned_polls = 0
+        self._uptime: int | None = None
+        # time of the last successful fetch of each category
+        self.category_updated: dict[str, datetime.datetime] = {}
+        # categories of which the last fetch failed, with the time of the first failure
+        self.stale_categories: dict[str, datetime.datetime] = {}
+        # stale categories that failed for longer than the stale age
+        self.expired_categories: set[str] = set()
+        # time of the last poll in which a category was fetched
+        self.last_reached: datetime.datetime | None = None
+        self.failed_categories: set[str] = set()
+        self.deferred_categories: set[str] = set()
+        # increased when a category becomes stale, expired or fresh again
+        self.stale_version = 0
         self.info = None
         self.id = None
         if self.username is None:
             self.username = "admin"
         self.password = password
-        self.properties = []
-        self._session.verify = False
+        self.properties = AlfenPropertyStore()
+        self.catalog = AlfenPropertyCatalog()
+        self.activity = AlfenPropertyActivity()
+        # keys changed since the coordinator last dispatched them, polls that are
+        # not started by the coordinator add to them as well
+        self.changed_properties: set[int] = set()
+        self._pending_changes: set[int] = set()
+        self.session.verify = False
         self.keep_logout = False
         self.max_allowed_phases = 1
         self.latest_tag = None
         self.transaction_offset = 0
         self.transaction_counter = 0
+        self.transaction_generation = 0
         self.ssl = ssl
-        self.static_properties = []
         self.get_static_properties = True
         self.logged_in = False
+        self.auth = AlfenAuthManager(self._async_login)
         self.last_updated = None
+        # called after a value is set successfully
+        self.on_value_set: Callable[[], None] | None = None
+        # the poll in flight, shared by the callers that request an update
+        self._update_task: asyncio.Task[bool] | None = None
+        self._update_scope: set[str] = set()
+        self._update_static = False
+        self._update_writes = 0
+        # the poll that runs once the one in flight is done
+        self._follow_up_task: asyncio.Task[bool] | None = None
+        self._follow_up_scope: set[str] = set()
+        # increased when a value is set, a poll that started before is outdated
+        self._writes = 0
 
     async def init(self) -> bool:
         """Initialize the Alfen API."""
@@ -87,26 +297,62 @@ class AlfenDevice:
 
     def get_number_of_sockets(self) -> int | None:
         """Get number of sockets from the properties."""
-        sockets = 1
-        for prop in self.properties:
-            if prop[ID] == "205E_0":
-                sockets = int(prop[VALUE])
-                break
-        return sockets
+        prop = self.properties.get(NUMBER_OF_SOCKETS_KEY)
+        if prop is None:
+            return 1
+        return int(prop.value)
 
     def get_licenses(self) -> list | None:
         """Get licenses from the properties."""
         licenses = []
-        for prop in self.properties:
-            if prop[ID] == "21A2_0":
-                for key, value in LICENSES.items():
-                    if int(prop[VALUE]) & int(value):
-                        licenses.append(key)
+        prop = self.properties.get(LICENSES_KEY)
+        if prop is not None:
+            for key, value in LICENSES.items():
+                if int(prop.value) & int(value):
+                    licenses.append(key)
         return licenses
 
+    def set_timeout(self, timeout: float) -> None:
+        """Set the seconds a poll may take.
+
+        An attempt of a request gets an equal share of it, so a request that
+        hangs leaves time to retry it in the same poll.
+        """
+        self.update_budget = timeout
+        self.retry_policy.timeout = min(
+            timeout, max(RETRY_MIN_TIMEOUT, timeout / RETRY_ATTEMPTS)
+        )
+
+    def set_fetch_ids(self, keys: Iterable[int] | None) -> None:
+        """Set the keys of the properties that are fetched by a poll.
+
+        With None every poll fetches the complete categories. The socket states
+        and the uptime are always fetched, they decide if the device is idle or
+        was rebooted.
+        """
+        self.fetch_ids = None if keys is None else {*keys, *DEVICE_KEYS}
+        self._fetch_plans.clear()
+
+    def is_idle(self) -> bool:
+        """Return True if the sockets are available and no vehicle is connected."""
+        for status_id, mode3_id in SOCKET_STATE_IDS[: self.get_number_of_sockets()]:
+            if self.get_property_value(status_id) != STATUS_AVAILABLE:
+                return False
+            mode3_state = self.get_property_value(mode3_id)
+            if mode3_state is not None and mode3_state not in MODE_3_STATES_NO_VEHICLE:
+                return False
+        return True
+
+    def get_property_value(self, api_param: str) -> Any:
+        """Return the current value of a property, if known."""
+        prop = self.properties.get(property_key(api_param))
+        if prop is None:
+            return None
+        return prop.value
+
     async def get_info(self) -> bool:
         """Get info from the API."""
-        response = await self._session.get(url=self.__get_url(INFO), ssl=self.ssl)
+        response = await self.session.get(url=self.__get_url(INFO), ssl=self.ssl)
         _LOGGER.debug("Response %s", str(response))
 
         if response.status == 200:
@@ -137,114 +383,342 @@ class AlfenDevice:
             "sw_version": self.info.firmware_version,
         }
 
-    async def async_update(self) -> bool:
-        """Update the device properties."""
+    async def async_update(self, categories: Iterable[str] | None = None) -> bool:
+        """Update the device properties.
+
+        Only the given categories are refreshed, by default all the categories of
+        the options. The first update after a change of the options loads all.
+        Return False only if every category failed.
+
+        Callers share the poll in flight when it covers their categories and no
+        value was set since it started. Otherwise they share one follow-up poll,
+        which runs when the poll in flight is done.
+        """
+        scope = set(self.category_options if categories is None else categories)
+        task = self._update_task
+        in_flight = task is not None and not task.done()
+        if in_flight and self._joins_update(scope):
+            return await asyncio.shield(task)
+
+        if self._follow_up_task is not None:
+            self._follow_up_scope |= scope
+        elif in_flight:
+            self._follow_up_scope = scope
+            self._follow_up_task = asyncio.create_task(self._async_follow_up(task))
+        else:
+            return await self._async_start_update(scope)
+        return await asyncio.shield(self._follow_up_task)
+
+    def _joins_update(self, scope: set[str]) -> bool:
+        """Return True if the poll in flight serves an update of the categories."""
+        if self._writes != self._update_writes:
+            return False
+        if self._update_static:
+            return True
+        return not self.get_static_properties and scope <= self._update_scope
+
+    async def _async_start_update(self, scope: set[str]) -> bool:
+        """Start a poll of the given categories and wait for it."""
+        self._update_scope = scope
+        self._update_static = self.get_static_properties
+        self._update_writes = self._writes
+        self._update_task = asyncio.create_task(self._async_update(scope))
+        return await asyncio.shield(self._update_task)
+
+    async def _async_follow_up(self, task: asyncio.Task[bool]) -> bool:
+        """Run the follow-up poll once the poll in flight is done."""
+        await asyncio.wait([task])
+        scope = self._follow_up_scope
+        self._follow_up_task = None
+        return await self._async_start_update(scope)
+
+    async def _async_update(self, categories: Iterable[str]) -> bool:
+        """Poll the given categories, see async_update."""
         if self.keep_logout:
+            self.failed_categories = set()
+            self.deferred_categories = set()
             return True
 
-        self.last_updated = datetime.datetime.now()
-        dynamic_properties = []
-        self.properties = []
-        if self.get_static_properties:
-            self.static_properties = []
+        if not self.yield_session:
+            return await self._async_poll(categories)
 
-        for cat in CATEGORIES:
-            if cat == CAT_TRANSACTIONS:
-                continue
-            if cat in self.category_options:
-                dynamic_properties = (
-                    dynamic_properties + await self._get_all_properties_value(cat)
-                )
-            elif self.get_static_properties:
-                self.static_properties = (
-                    self.static_properties + await self._get_all_properties_value(cat)
-                )
-        self.properties = self.static_properties + dynamic_properties
-        self.get_static_properties = False
+        # the wallbox allows one logged in client, only hold the session for the
+        # burst so other clients can log in between the polls
+        async with self._async_yield_burst():
+            return await self._async_poll(categories)
+
+    async def _async_poll(self, categories: Iterable[str]) -> bool:
+        """Fetch the given categories and commit them."""
+        self.last_updated = datetime.datetime.now()
+        deadline = asyncio.get_running_loop().time() + self.update_budget
+
+        # the poll is staged and committed at once, so entities keep reading the
+        # previous snapshot until every category is fetched
+        categories = [
+            cat
+            for cat in CATEGORY_PRIORITY
+            if cat in categories or self.get_static_properties
+        ]
+        # the limit applies to the page requests, so pages of one category can be
+        # fetched in parallel without starving the other categories
+        self._fetch_semaphore = asyncio.Semaphore(self.fetch_concurrency)
+        if self.fetch_ids is not None and not self.get_static_properties:
+            staged = {}
+            updates, failed, deferred = await self._get_planned_properties_value(
+                categories, deadline
+            )
+        else:
+            results, unfinished = await self._gather_until(
+                [self._get_all_properties_value(cat) for cat in categories], deadline
+            )
+            deferred = {categories[index] for index in unfinished}
+            staged = {
+                cat: properties
+                for cat, properties in zip(categories, results, strict=True)
+                if properties is not None
+            }
+            failed = set(categories) - staged.keys() - deferred
+            updates = {}
+            # the known properties and their categories can have changed
+            self._fetch_plans.clear()
+
+        if len(deferred) == len(categories):
+            # nothing finished in time, the wallbox does not respond
+            failed |= deferred
+            deferred = set()
+        elif deferred:
+            _LOGGER.debug("Deferred %s to the next update", sorted(deferred))
+
+        reached = not categories or len(failed) < len(categories)
+        if reached:
+            self.last_reached = datetime.datetime.now()
+
+        # categories that are not refreshed, failed or deferred keep their slice
+        # from the last fetch, properties that disappeared count as changed
+        self._pending_changes.update(self.properties.commit(staged, updates))
+        self._update_staleness(
+            [cat for cat in categories if cat not in deferred], failed
+        )
+        self.failed_categories = failed
+        self.deferred_categories = deferred
+        # load all categories again until every category succeeded once
+        self.get_static_properties = self.get_static_properties and bool(
+            failed or deferred
+        )
+
+        prop = self.properties.get(UPTIME_KEY)
+        if prop is not None and isinstance(prop.value, int):
+            if self._uptime is not None and prop.value < self._uptime:
+                # static properties can have changed with the reboot, load all
+                _LOGGER.info("Wallbox %s was rebooted", self.name)
+                self.get_static_properties = True
+            self._uptime = prop.value
+
+        self.changed_properties |= self._pending_changes
+        self._pending_changes = set()
 
         if CAT_TRANSACTIONS in self.category_options:
             if self.transaction_counter == 0:
-                await self._get_transaction()
-                self.transaction_counter += 1
-
-        return True
-
-    async def _post(
-        self, cmd, payload=None, allowed_login=True
-    ) -> ClientResponse | None:
-        """Send a POST request to the API."""
+                try:
+                    async with asyncio.timeout_at(deadline):
+                        await self._get_transaction()
+                except TimeoutError:
+                    _LOGGER.debug("Deferred the transactions to the next update")
+                else:
+                    self.transaction_counter += 1
+                    self.transaction_generation += 1
+
+        # when every category failed the entities keep their last values, the
+        # expired categories decide which become unavailable, until the wallbox
+        # did not answer for the stale age
+        return reached or (
+            self.last_reached is not None
+            and (datetime.datetime.now() - self.last_reached).total_seconds()
+            < self.stale_age
+        )
+
+    async def _gather_until(
+        self, requests: list[Coroutine[Any, Any, _T]], deadline: float
+    ) -> tuple[list[_T | None], set[int]]:
+        """Run the requests until the loop time reaches the deadline.
+
+        The requests wait for the fetch semaphore in the given order. Return the
+        results, None for the requests that did not finish, and the indexes of
+        those requests. They are cancelled.
+        """
+        tasks = [asyncio.create_task(request) for request in requests]
+        if not tasks:
+            return [], set()
+        _, pending = await asyncio.wait(
+            tasks, timeout=max(0.0, deadline - asyncio.get_running_loop().time())
+        )
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.wait(pending)
+        return (
+            [None if task in pending else task.result() for task in tasks],
+            {index for index, task in enumerate(tasks) if task in pending},
+        )
+
+    def _update_staleness(self, categories: list[str], failed: set[str]) -> None:
+        """Track the categories that failed, and since when."""
+        now = datetime.datetime.now()
+        for category in categories:
+            if category in failed:
+                changed = category not in self.stale_categories
+                since = self.stale_categories.setdefault(category, now)
+                if (
+                    category not in self.expired_categories
+                    and (now - since).total_seconds() >= self.stale_age
+                ):
+                    self.expired_categories.add(category)
+                    changed = True
+            else:
+                self.category_updated[category] = now
+                changed = self.stale_categories.pop(category, None) is not None
+                self.expired_categories.discard(category)
+
+            if changed:
+                # let the entities of the category update their state
+                self.stale_version += 1
+                self._pending_changes.update(self.properties.get_slice(category))
+
+    async def _request(
+        self,
+        method: str,
+        cmd: str,
+        payload: dict | None = None,
+        allowed_login: bool = True,
+        json_decode: bool = True,
+    ) -> Any:
+        """Send a request to the API with the retry policy.
+
+        After a 401 the device logs in again once. Timeouts, connection errors
+        and server errors are retried after a backoff, until the attempts or the
+        deadline run out. A GET returns the decoded body, a POST the response.
+        Return None if the request failed.
+        """
         if self.keep_logout:
             return None
 
-        try:
-            _LOGGER.debug("Send Post Request")
-            async with self._session.post(
-                url=self.__get_url(cmd),
-                json=payload,
-                headers=POST_HEADER_JSON,
-                timeout=DEFAULT_TIMEOUT,
-                ssl=self.ssl,
-            ) as response:
-                if response.status == 401 and allowed_login:
-                    self.logged_in = False
-                    _LOGGER.debug("POST with login")
-                    await self.login()
-                    return await self._post(cmd, payload, False)
-                response.raise_for_status()
-                return response
-        except json.JSONDecodeError as e:
-            # skip tailing comma error from alfen
-            _LOGGER.debug("trailing comma is not allowed")
-            if e.msg == "trailing comma is not allowed":
+        policy = self.retry_policy
+        policy.requests += 1
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + policy.deadline
+        url = self.__get_url(cmd)
+        attempt = 0
+        while True:
+            attempt += 1
+            if allowed_login:
+                await self.auth.async_wait()
+            login_generation = self.auth.generation
+            sent = loop.time()
+            timeout = ClientTimeout(total=policy.get_timeout(deadline - loop.time()))
+            try:
+                if method == METHOD_GET:
+                    request = self.session.get(url, timeout=timeout, ssl=self.ssl)
+                else:
+                    request = self.session.post(
+                        url=url,
+                        json=payload,
+                        headers=POST_HEADER_JSON,
+                        timeout=timeout,
+                        ssl=self.ssl,
+                    )
+                async with request as response:
+                    if response.status != 401 or not allowed_login:
+                        response.raise_for_status()
+                        if allowed_login:
+                            self.auth.on_success(sent)
+                        if method != METHOD_GET:
+                            return response
+                        if json_decode:
+                            return await response.json(content_type=None)
+                        return await response.text()
+
+                # the session expired, log in again before the retry, requests
+                # that got a 401 at the same time share the login
+                policy.unauthorized += 1
+                allowed_login = False
+                self.logged_in = False
+                _LOGGER.debug("%s %s with login", method, cmd)
+                await self.auth.async_relogin(login_generation, sent)
+                error = "unauthorized"
+            except ClientResponseError as e:
+                if e.status < 500 and e.status != 429:
+                    policy.failures += 1
+                    _LOGGER.error("Unexpected error on %s %s: %s", method, cmd, e)
+                    return None
+                policy.errors += 1
+                error = str(e)
+            except TimeoutError:
+                policy.timeouts += 1
+                error = "timeout"
+            except ClientError as e:
+                policy.errors += 1
+                error = str(e)
+            except json.JSONDecodeError as e:
+                # the wallbox can answer with a trailing comma, nothing to retry
+                policy.failures += 1
+                _LOGGER.debug("JSONDecodeError on %s %s: %s", method, cmd, e.msg)
+                return None
+            except Exception as e:  # pylint: disable=broad-except  # noqa: BLE001
+                policy.failures += 1
+                _LOGGER.error("Unexpected error on %s %s: %s", method, cmd, e)
                 return None
 
-            _LOGGER.error("JSONDecodeError error on POST %s", str(e))
-        except TimeoutError:
-            _LOGGER.warning("Timeout on POST")
-        except Exception as e:  # pylint: disable=broad-except  # noqa: BLE001
-            if not allowed_login:
-                _LOGGER.error("Unexpected error on POST %s", str(e))
-
-        return None
+            delay = policy.get_delay(attempt)
+            if not policy.should_retry(attempt, delay, deadline - loop.time()):
+                policy.failures += 1
+                _LOGGER.warning(
+                    "%s %s failed after %s attempts: %s", method, cmd, attempt, error
+                )
+                return None
+            policy.retries += 1
+            _LOGGER.debug(
+                "Retry %s %s in %.1f seconds after %s", method, cmd, delay, error
+            )
+            await asyncio.sleep(delay)
 
-    async def _get(
-        self, url, allowed_login=True, json_decode=True
+    async def _post(
+        self, cmd, payload=None, allowed_login=True
     ) -> ClientResponse | None:
-        """Send a GET request to the API."""
-        if self.keep_logout:
-            return None
+        """Send a POST request to the API."""
+        return await self._request(METHOD_POST, cmd, payload, allowed_login)
 
-        try:
-            async with self._session.get(
-                url, timeout=DEFAULT_TIMEOUT, ssl=self.ssl
-            ) as response:
-                if response.status == 401 and allowed_login:
-                    self.logged_in = False
-                    _LOGGER.debug("GET with login")
-                    await self.login()
-                    return await self._get(url, False)
-
-                response.raise_for_status()
-                if json_decode:
-                    _resp = await response.json(content_type=None)
-                else:
-                    _resp = await response.text()
-                return _resp
-        except TimeoutError:
-            _LOGGER.warning("Timeout on GET")
-            return None
-        except Exception as e:  # pylint: disable=broad-except  # noqa: BLE001
-            if not allowed_login:
-                _LOGGER.error("Unexpected error on GET %s", str(e))
-            return None
+    async def _get(self, cmd, allowed_login=True, json_decode=True) -> Any:
+        """Send a GET request to the API."""
+        return await self._request(
+            METHOD_GET, cmd, allowed_login=allowed_login, json_decode=json_decode
+        )
 
     async def login(self):
-        """Login to the API."""
+        """Login to the API, this resumes the polls after a logout."""
         self.keep_logout = False
+        await self.auth.async_login()
+
+    async def async_renew_session(self) -> None:
+        """Use the session before the wallbox ends it for being idle.
+
+        An authenticated request extends the session, when it expired already
+        the login happens here instead of in the next poll.
+        """
+        if (
+            self.keep_logout
+            or self.yield_session
+            or (self._update_task is not None and not self._update_task.done())
+        ):
+            return
+        self.auth.renewals += 1
+        await self._get(f"{PROP}?{IDS}={property_id(UPTIME_KEY)}")
 
+    async def _async_login(self):
+        """Send the login request, serialized by the auth manager."""
         try:
             response = await self._post(
                 cmd=LOGIN,
+                allowed_login=False,
                 payload={
                     PARAM_USERNAME: self.username,
                     PARAM_PASSWORD: self.password,
@@ -259,6 +733,27 @@ class AlfenDevice:
             _LOGGER.error("Unexpected error on LOGIN %s", str(e))
             return
 
+    @asynccontextmanager
+    async def _async_yield_burst(self) -> AsyncIterator[None]:
+        """Log in for a burst of requests and log out after it.
+
+        A poll and a write wait for each other, so neither logs out under the
+        other.
+        """
+        async with self._yield_lock:
+            # not login, a burst never undoes a logout by the user
+            await self.auth.async_login()
+            try:
+                yield
+            finally:
+                await self._async_end_session()
+
+    async def _async_end_session(self) -> None:
+        """Log out after a poll burst, without stopping the polls."""
+        await self._post(cmd=LOGOUT, allowed_login=False)
+        self.logged_in = False
+        self.auth.end_lease()
+
     async def logout(self):
         """Logout from the API."""
         self.keep_logout = True
@@ -277,77 +772,217 @@ class AlfenDevice:
         self, api_param, value, allowed_login=True
     ) -> ClientResponse | None:
         """Update a value on the API."""
-        if self.keep_logout:
-            return None
-
-        try:
-            async with self._session.post(
-                url=self.__get_url(PROP),
-                json={api_param: {ID: api_param, VALUE: str(value)}},
-                headers=POST_HEADER_JSON,
-                timeout=DEFAULT_TIMEOUT,
-                ssl=self.ssl,
-            ) as response:
-                if response.status == 401 and allowed_login:
-                    self.logged_in = False
-                    _LOGGER.debug("POST(Update) with login")
-                    await self.login()
-                    return await self._update_value(api_param, value, False)
-                response.raise_for_status()
-                return response
-        except Exception as e:  # pylint: disable=broad-except  # noqa: BLE001
-            if not allowed_login:
-                _LOGGER.error("Unexpected error on UPDATE VALUE %s", str(e))
-            return None
+        return await self._post(
+            PROP, {api_param: {ID: api_param, VALUE: str(value)}}, allowed_login
+        )
 
     async def _get_value(self, api_param):
         """Get a value from the API."""
         cmd = f"{PROP}?{ID}={api_param}"
-        response = await self._get(url=self.__get_url(cmd))
+        response = await self._get(cmd)
         _LOGGER.debug("Status Response %s: %s", cmd, str(response))
 
         if response is not None:
-            if self.properties is None:
-                self.properties = []
             for resp in response[PROPERTIES]:
-                for prop in self.properties:
-                    if prop[ID] == resp[ID]:
-                        prop[VALUE] = resp[VALUE]
-                        break
-
-    async def _get_all_properties_value(self, category: str) -> list:
-        """Get all properties from the API."""
+                prop = self.properties.get(property_key(resp[ID]))
+                if prop is not None:
+                    prop.set_value(resp[VALUE])
+                    self.properties.touch(prop)
+                    self._pending_changes.add(prop.key)
+
+    def _ingest_properties(
+        self, response: list[dict], properties: dict[int, AlfenProperty]
+    ) -> None:
+        """Stage the properties of a response, reusing the unchanged records."""
+        for resp in response:
+            previous = self.properties.get(property_key(resp[ID]))
+            prop = AlfenProperty.from_response(resp, previous)
+            if prop is not previous:
+                self._pending_changes.add(prop.key)
+                self.catalog.add(prop)
+            if previous is not None:
+                self.activity.observe(prop.key, prop is not previous)
+            properties[prop.key] = prop
+
+    async def _get_all_properties_value(
+        self, category: str
+    ) -> dict[int, AlfenProperty] | None:
+        """Get all properties of a category from the API."""
         _LOGGER.debug("Get properties")
 
-        properties = []
+        properties: dict[int, AlfenProperty] | None = {}
+        count = 0
         tx_start = datetime.datetime.now()
-        nextRequest = True
-        offset = 0
-        attempt = 0
 
-        while nextRequest:
-            attempt += 1
-            cmd = f"{PROP}?{CAT}={category}&{OFFSET}={offset}"
-            response = await self._get(url=self.__get_url(cmd))
-            _LOGGER.debug("Status Response %s: %s", cmd, str(response))
-
-            if response is not None:
-                attempt = 0
-                properties += response[PROPERTIES]
-                nextRequest = response[TOTAL] > (offset + len(response[PROPERTIES]))
-                offset += len(response[PROPERTIES])
-            elif attempt >= 3:
-                # This only possible in case of series of timeouts or unknown exceptions in self._get()
-                # It's better to break completely, otherwise we can provide partial data in self.properties.
-                _LOGGER.debug("Returning earlier after %s attempts", str(attempt))
-                self.properties = []
-                break
+        response = await self._get_properties_page(category, 0)
+        if response is not None:
+            pages = [response[PROPERTIES]]
+            page_size = len(pages[0])
+            if page_size:
+                # the first page tells the total and the page size, request the
+                # remaining pages in parallel and ingest them in order
+                responses = await asyncio.gather(
+                    *(
+                        self._get_properties_page(category, offset)
+                        for offset in range(page_size, response[TOTAL], page_size)
+                    )
+                )
+                if None in responses:
+                    pages = None
+                else:
+                    pages.extend(response[PROPERTIES] for response in responses)
+        else:
+            pages = None
+
+        if pages is None:
+            # It's better to keep the previous slice of this category completely,
+            # otherwise we can provide partial data in self.properties.
+            properties = None
+        else:
+            for page in pages:
+                self._ingest_properties(page, properties)
+                count += len(page)
 
-        _LOGGER.debug("Properties %s", str(properties))
         runtime = datetime.datetime.now() - tx_start
-        _LOGGER.info("Called %s in %.2f seconds", category, runtime.total_seconds())
+        _LOGGER.info(
+            "Called %s (%s properties) in %.2f seconds",
+            category,
+            count,
+            runtime.total_seconds(),
+        )
         return properties
 
+    async def _get_planned_properties_value(
+        self, categories: list[str], deadline: float
+    ) -> tuple[dict[str, dict[int, AlfenProperty]], set[str], set[str]]:
+        """Get the properties used by the entities with ids requests.
+
+        Only the fetched properties are staged, as updates of their category,
+        properties that are not fetched keep their last value. Return the staged
+        updates, the categories of which a request failed and the categories of
+        which a request did not finish before the deadline.
+        """
+        if self._fetch_plans_version != self.activity.version:
+            # properties changed class
+            self._fetch_plans.clear()
+            self._fetch_plans_version = self.activity.version
+
+        self._planned_polls += 1
+        classes: tuple[str, ...] = (PROPERTY_HOT,)
+        if self._planned_polls % SLOW_POLL_ROUNDS == 1:
+            classes += (PROPERTY_SLOW,)
+        if self._planned_polls % STATIC_POLL_ROUNDS == 1:
+            classes += (PROPERTY_STATIC,)
+        plan_key = (tuple(categories), classes)
+        plan = self._fetch_plans.get(plan_key)
+        if plan is None:
+            plan = self._fetch_plans[plan_key] = self._build_fetch_plan(
+                categories, classes
+            )
+
+        tx_start = datetime.datetime.now()
+        responses, unfinished = await self._gather_until(
+            [self._get_properties(cmd) for cmd, _ in plan], deadline
+        )
+
+        fetched: dict[str, list[dict]] = {}
+        failed: set[str] = set()
+        deferred: set[str] = set()
+        for index, ((_, chunk_categories), response) in enumerate(
+            zip(plan, responses, strict=True)
+        ):
+            if index in unfinished:
+                deferred.update(chunk_categories)
+                continue
+            if response is None:
+                failed.update(chunk_categories)
+                continue
+            for resp in response[PROPERTIES]:
+                fetched.setdefault(resp.get(CAT, ""), []).append(resp)
+
+        staged: dict[str, dict[int, AlfenProperty]] = {}
+        for category, page in fetched.items():
+            if category in failed or category in deferred:
+                # keep the last good slice of the category as a whole
+                continue
+            properties: dict[int, AlfenProperty] = {}
+            self._ingest_properties(page, properties)
+            staged[category] = properties
+
+        runtime = datetime.datetime.now() - tx_start
+        _LOGGER.info(
+            "Called %s ids requests (%s properties) in %.2f seconds",
+            len(plan),
+            sum(len(page) for page in fetched.values()),
+            runtime.total_seconds(),
+        )
+        return staged, failed - deferred, deferred
+
+    def _build_fetch_plan(
+        self, categories: list[str], classes: tuple[str, ...]
+    ) -> list[tuple[str, frozenset[str]]]:
+        """Split the properties used by the entities in ids requests.
+
+        Only properties that are known from a category fetch are requested, the
+        ids are packed in as few requests as the URL length allows, in the order
+        of the category priority. Every request comes with the categories of its
+        ids. Properties of the live categories are requested whatever their
+        class, the others only when their class is in the given classes.
+        """
+        props = sorted(
+            (
+                prop
+                for key in self.fetch_ids
+                if (prop := self.properties.get(key)) is not None
+                and prop.category in categories
+                and (
+                    key in DEVICE_KEYS
+                    or prop.category in LIVE_CATEGORIES
+                    or self.activity.get_class(key) in classes
+                )
+            ),
+            key=lambda prop: (CATEGORY_RANK[prop.category], prop.id),
+        )
+        cmd = f"{PROP}?{IDS}="
+        max_length = MAX_URL_LENGTH - len(self.__get_url(cmd))
+        plan: list[tuple[str, frozenset[str]]] = []
+        chunk: list[AlfenProperty] = []
+        length = 0
+        for prop in props:
+            if chunk and length + len(prop.id) > max_length:
+                plan.append(self._get_fetch_request(cmd, chunk))
+                chunk = []
+                length = 0
+            chunk.append(prop)
+            length += len(prop.id) + 1
+
+        if chunk:
+            plan.append(self._get_fetch_request(cmd, chunk))
+
+        _LOGGER.debug("Fetch plan for %s: %s", categories, plan)
+        return plan
+
+    @staticmethod
+    def _get_fetch_request(
+        cmd: str, chunk: list[AlfenProperty]
+    ) -> tuple[str, frozenset[str]]:
+        """Return the ids request of the properties and their categories."""
+        return (
+            cmd + ",".join(prop.id for prop in chunk),
+            frozenset(prop.category for prop in chunk),
+        )
+
+    async def _get_properties_page(self, category: str, offset: int) -> dict | None:
+        """Get one page of properties of a category from the API."""
+        return await self._get_properties(f"{PROP}?{CAT}={category}&{OFFSET}={offset}")
+
+    async def _get_properties(self, cmd: str) -> dict | None:
+        """Get properties from the API, retried by the retry policy."""
+        async with self._fetch_semaphore:
+            response = await self._get(cmd)
+        _LOGGER.debug("Status Response %s: %s", cmd, str(response))
+        return response
+
     async def reboot_wallbox(self):
         """Reboot the wallbox."""
         response = await self._post(cmd=CMD, payload={PARAM_COMMAND: "reboot"})
@@ -360,7 +995,7 @@ class AlfenDevice:
         counter = 0
         while transactionLoop:
             response = await self._get(
-                url=self.__get_url("transactions?offset=" + str(offset)),
+                "transactions?offset=" + str(offset),
                 json_decode=False,
             )
             # _LOGGER.debug(response)
@@ -504,7 +1139,7 @@ class AlfenDevice:
     async def request(self, method: str, cmd: str, json_data=None) -> ClientResponse:
         """Send a request to the API."""
         if method == METHOD_GET:
-            response = await self._get(url=self.__get_url(cmd))
+            response = await self._get(cmd)
         else:  # METHOD_POST
             response = await self._post(cmd=cmd, payload=json_data)
 
@@ -513,15 +1148,31 @@ class AlfenDevice:
 
     async def set_value(self, api_param, value):
         """Set a value on the API."""
-        response = await self._update_value(api_param, value)
+        if self.keep_logout:
+            _LOGGER.debug("Logged out, not setting %s to %s", api_param, value)
+            return
+        if self.catalog.is_writable(property_key(api_param)) is False:
+            # the write flag is not confirmed, let the wallbox decide
+            _LOGGER.debug(
+                "Property %s is reported read-only, setting %s anyway", api_param, value
+            )
+
+        if self.yield_session:
+            async with self._async_yield_burst():
+                response = await self._update_value(api_param, value)
+        else:
+            response = await self._update_value(api_param, value)
         if response:
+            self._writes += 1
             # we expect that the value is updated so we are just update the value in the properties
-            for index, prop in enumerate(self.properties):
-                if prop[ID] == api_param:
-                    _LOGGER.debug("Set %s value %s", str(api_param), str(value))
-                    prop[VALUE] = value
-                    self.properties[index] = prop
-                    break
+            prop = self.properties.get(property_key(api_param))
+            if prop is not None:
+                _LOGGER.debug("Set %s value %s", str(api_param), str(value))
+                prop.set_value(value)
+                self.properties.touch(prop)
+                self._pending_changes.add(prop.key)
+            if self.on_value_set is not None:
+                self.on_value_set()
 
     async def get_value(self, api_param):
         """Get a value from the API."""
@@ -9,12 +9,10 @@ from homeassistant.components.binary_sensor import (
     BinarySensorEntity,
     BinarySensorEntityDescription,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import (
-    CAT,
-    ID,
     LICENSE_HIGH_POWER,
     LICENSE_LOAD_BALANCING_ACTIVE,
     LICENSE_LOAD_BALANCING_STATIC,
@@ -24,7 +22,6 @@ from .const import (
     LICENSE_PERSONALIZED_DISPLAY,
     LICENSE_RFID,
     LICENSE_SCN,
-    VALUE,
 )
 from .coordinator import AlfenConfigEntry
 from .entity import AlfenEntity
@@ -45,6 +42,9 @@ class AlfenBinaryDescription(
 ):
     """Class to describe an Alfen binary sensor entity."""
 
+    # declared here, a default in the mixin would come before the key field
+    depends_on: tuple[str, ...] | None = None
+
 
 ALFEN_BINARY_SENSOR_TYPES: Final[tuple[AlfenBinaryDescription, ...]] = (
     AlfenBinaryDescription(
@@ -58,48 +58,56 @@ ALFEN_BINARY_SENSOR_TYPES: Final[tuple[AlfenBinaryDescription, ...]] = (
         name="License Smart Charging Network",
         device_class=None,
         api_param=None,
+        depends_on=("21A2_0",),
     ),
     AlfenBinaryDescription(
         key="license_active_loadbalancing",
         name="License Active Loadbalancing",
         device_class=None,
         api_param=None,
+        depends_on=("21A2_0",),
     ),
     AlfenBinaryDescription(
         key="license_static_loadbalancing",
         name="License Static Loadbalancing",
         device_class=None,
         api_param=None,
+        depends_on=("21A2_0",),
     ),
     AlfenBinaryDescription(
         key="license_high_power_sockets",
         name="License 32A Output per Socket",
         device_class=None,
         api_param=None,
+        depends_on=("21A2_0",),
     ),
     AlfenBinaryDescription(
         key="license_rfid_reader",
         name="License RFID Reader",
         device_class=None,
         api_param=None,
+        depends_on=("21A2_0",),
     ),
     AlfenBinaryDescription(
         key="license_personalized_display",
         name="License Personalized Display",
         device_class=None,
         api_param=None,
+        depends_on=("21A2_0",),
     ),
     AlfenBinaryDescription(
         key="license_mobile_3G_4G",
         name="License Mobile 3G & 4G",
         device_class=None,
         api_param=None,
+        depends_on=("21A2_0",),
     ),
     AlfenBinaryDescription(
         key="license_giro_e",
         name="License Giro-e Payment",
         device_class=None,
         api_param=None,
+        depends_on=("21A2_0",),
     ),
     AlfenBinaryDescription(
         key="https_api_login_status",
@@ -134,19 +142,18 @@ class AlfenBinarySensor(AlfenEntity, BinarySensorEntity):
         self, entry: AlfenConfigEntry, description: AlfenBinaryDescription
     ) -> None:
         """Initialize."""
-        super().__init__(entry)
+        super().__init__(entry, description)
         self._attr_name = f"{self.coordinator.device.name} {description.name}"
         self._attr_unique_id = f"{self.coordinator.device.id}_{description.key}"
-        self.entity_description = description
+        self._async_refresh_attrs()
 
         licenses = self.coordinator.device.get_licenses()
 
         # custom code for license
         if self.entity_description.api_param is None:
             # check if license is available
-            if "21A2_0" in self.coordinator.device.properties:
-                if self.coordinator.device.properties["21A2_0"][VALUE] == LICENSE_NONE:
-                    return
+            if self.coordinator.device.get_property_value("21A2_0") == LICENSE_NONE:
+                return
             _LOGGER.debug(licenses)
             if self.entity_description.key == "license_scn":
                 self._attr_is_on = LICENSE_SCN in licenses
@@ -176,28 +183,25 @@ class AlfenBinarySensor(AlfenEntity, BinarySensorEntity):
     #            if self.entity_description.key == "license_expose_smartmeterdata":
     #                self._attr_is_on = LICENSE_EXPOSE_SMARTMETERDATA in licenses
 
+    @callback
+    def _async_update_attrs(self) -> None:
+        """Update the binary sensor attributes."""
+        if self.entity_description.api_param is None:
+            return
+
+        prop = self.coordinator.device.properties.get(self._api_key)
+        self._attr_available = prop is not None
+        self._attr_is_on = prop is not None and prop.value == 1
+        self._attr_extra_state_attributes = self._get_property_attributes(prop)
+
     @property
     def available(self) -> bool:
         """Return True if entity is available."""
-
-        if self.entity_description.api_param is not None:
-            for prop in self.coordinator.device.properties:
-                if prop[ID] == self.entity_description.api_param:
-                    return True
-            return False
-
-        return True
+        return self._attr_available and not self._expired
 
     @property
     def is_on(self) -> bool:
         """Return True if entity is on."""
-
-        if self.entity_description.api_param is not None:
-            for prop in self.coordinator.device.properties:
-                if prop[ID] == self.entity_description.api_param:
-                    return prop[VALUE] == 1
-            return False
-
         if self.entity_description.key == "https_api_login_status":
             return self.coordinator.device.logged_in
 
@@ -206,11 +210,7 @@ class AlfenBinarySensor(AlfenEntity, BinarySensorEntity):
     @property
     def extra_state_attributes(self) -> dict | None:
         """Return the default attributes of the element."""
-        for prop in self.coordinator.device.properties:
-            if prop[ID] == self.entity_description.api_param:
-                return {"category": prop[CAT]}
-
         if self.entity_description.key == "https_api_login_status":
             return {"last_updated": self.coordinator.device.last_updated}
 
-        return None
+        return super().extra_state_attributes
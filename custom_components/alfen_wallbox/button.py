@@ -89,10 +89,13 @@ class AlfenButton(AlfenEntity, ButtonEntity):
         description: AlfenButtonDescription,
     ) -> None:
         """Initialize the Alfen button entity."""
-        super().__init__(entry)
+        super().__init__(entry, description)
         self._attr_name = f"{self.coordinator.device.name} {description.name}"
         self._attr_unique_id = f"{self.coordinator.device.id}-{description.key}"
-        self.entity_description = description
+
+    def _get_api_params(self) -> tuple[int, ...] | None:
+        """Buttons do not depend on any property."""
+        return ()
 
     async def async_press(self) -> None:
         """Press the button."""
@@ -24,17 +24,40 @@ from homeassistant.helpers import config_validation as cv
 
 from .const import (
     CATEGORIES,
+    CONF_CATEGORY_INTERVAL,
+    CONF_FETCH_CONCURRENCY,
+    CONF_FRESHNESS_TARGET,
+    CONF_IDLE_SCAN_INTERVAL,
     CONF_REFRESH_CATEGORIES,
+    CONF_STALE_AGE,
+    CONF_TARGETED_FETCH,
+    CONF_YIELD_SESSION,
+    DEFAULT_CATEGORY_INTERVALS,
+    DEFAULT_FETCH_CONCURRENCY,
+    DEFAULT_FRESHNESS_TARGET,
+    DEFAULT_IDLE_SCAN_INTERVAL,
     DEFAULT_REFRESH_CATEGORIES,
     DEFAULT_SCAN_INTERVAL,
+    DEFAULT_STALE_AGE,
+    DEFAULT_TARGETED_FETCH,
     DEFAULT_TIMEOUT,
+    DEFAULT_YIELD_SESSION,
     DOMAIN,
 )
 
 DEFAULT_OPTIONS = {
     CONF_SCAN_INTERVAL: DEFAULT_SCAN_INTERVAL,
+    CONF_IDLE_SCAN_INTERVAL: DEFAULT_IDLE_SCAN_INTERVAL,
     CONF_TIMEOUT: DEFAULT_TIMEOUT,
+    CONF_STALE_AGE: DEFAULT_STALE_AGE,
     CONF_REFRESH_CATEGORIES: DEFAULT_REFRESH_CATEGORIES,
+    CONF_FETCH_CONCURRENCY: DEFAULT_FETCH_CONCURRENCY,
+    CONF_TARGETED_FETCH: DEFAULT_TARGETED_FETCH,
+    CONF_YIELD_SESSION: DEFAULT_YIELD_SESSION,
+    CONF_FRESHNESS_TARGET: DEFAULT_FRESHNESS_TARGET,
+} | {
+    f"{CONF_CATEGORY_INTERVAL}_{category}": interval
+    for category, interval in DEFAULT_CATEGORY_INTERVALS.items()
 }
 
 
@@ -58,18 +81,63 @@ class AlfenOptionsFlowHandler(OptionsFlow):
                             CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL
                         ),
                     ): vol.All(vol.Coerce(int), vol.Range(min=1, max=300)),
+                    vol.Required(
+                        CONF_IDLE_SCAN_INTERVAL,
+                        default=self.config_entry.options.get(
+                            CONF_IDLE_SCAN_INTERVAL, DEFAULT_IDLE_SCAN_INTERVAL
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=3600)),
                     vol.Required(
                         CONF_TIMEOUT,
                         default=self.config_entry.options.get(
                             CONF_TIMEOUT, DEFAULT_TIMEOUT
                         ),
                     ): vol.All(vol.Coerce(int), vol.Range(min=1, max=30)),
+                    vol.Required(
+                        CONF_STALE_AGE,
+                        default=self.config_entry.options.get(
+                            CONF_STALE_AGE, DEFAULT_STALE_AGE
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=86400)),
                     vol.Required(
                         CONF_REFRESH_CATEGORIES,
                         default=self.config_entry.options.get(
                             CONF_REFRESH_CATEGORIES, DEFAULT_REFRESH_CATEGORIES
                         ),
                     ): cv.multi_select(CATEGORIES),
+                    vol.Required(
+                        CONF_FETCH_CONCURRENCY,
+                        default=self.config_entry.options.get(
+                            CONF_FETCH_CONCURRENCY, DEFAULT_FETCH_CONCURRENCY
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=len(CATEGORIES))),
+                    vol.Required(
+                        CONF_TARGETED_FETCH,
+                        default=self.config_entry.options.get(
+                            CONF_TARGETED_FETCH, DEFAULT_TARGETED_FETCH
+                        ),
+                    ): bool,
+                    vol.Required(
+                        CONF_YIELD_SESSION,
+                        default=self.config_entry.options.get(
+                            CONF_YIELD_SESSION, DEFAULT_YIELD_SESSION
+                        ),
+                    ): bool,
+                    vol.Required(
+                        CONF_FRESHNESS_TARGET,
+                        default=self.config_entry.options.get(
+                            CONF_FRESHNESS_TARGET, DEFAULT_FRESHNESS_TARGET
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=3600)),
+                }
+                | {
+                    vol.Required(
+                        f"{CONF_CATEGORY_INTERVAL}_{category}",
+                        default=self.config_entry.options.get(
+                            f"{CONF_CATEGORY_INTERVAL}_{category}", interval
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=86400))
+                    for category, interval in DEFAULT_CATEGORY_INTERVALS.items()
                 },
             ),
         )
@@ -0,0 +1,140 @@
+"""Connection pool for the Alfen Wallbox API."""
+
+from __future__ import annotations
+
+from ssl import (
+    CERT_NONE,
+    PROTOCOL_TLS_CLIENT,
+    MemoryBIO,
+    SSLContext,
+    SSLObject,
+    SSLSession,
+)
+from types import SimpleNamespace
+from typing import Any
+
+from aiohttp import (
+    ClientSession,
+    TCPConnector,
+    TraceConfig,
+    TraceConnectionCreateEndParams,
+    TraceConnectionReuseconnParams,
+)
+
+from .const import CONNECTION_LIMIT
+
+
+class AlfenSSLContext(SSLContext):
+    """Client SSL context that resumes the TLS session of an earlier connection.
+
+    asyncio does not pass a session when it wraps a connection, so the context
+    remembers the last connection to each host and offers its session to the
+    next one. A resumed handshake skips the key exchange, which is slow on the
+    embedded web server of the wallbox.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Initialize the context."""
+        super().__init__()
+        self._connections: dict[str | None, SSLObject] = {}
+        self._sessions: dict[str | None, SSLSession] = {}
+
+    def wrap_bio(
+        self,
+        incoming: MemoryBIO,
+        outgoing: MemoryBIO,
+        server_side: bool = False,
+        server_hostname: str | None = None,
+        session: SSLSession | None = None,
+    ) -> SSLObject:
+        """Wrap a connection, with the last TLS session of the host."""
+        if server_side:
+            return super().wrap_bio(incoming, outgoing, server_side, server_hostname)
+
+        # the session of a connection is only known after its handshake
+        previous = self._connections.get(server_hostname)
+        if previous is not None and previous.session is not None:
+            self._sessions[server_hostname] = previous.session
+        if session is None:
+            session = self._sessions.get(server_hostname)
+        ssl_object = super().wrap_bio(
+            incoming, outgoing, server_side, server_hostname, session
+        )
+        self._connections[server_hostname] = ssl_object
+        return ssl_object
+
+
+def create_ssl_context() -> AlfenSSLContext:
+    """Create the SSL context for the connections to the wallboxes.
+
+    The wallbox has a self-signed certificate and needs the default ciphers.
+    """
+    context = AlfenSSLContext(PROTOCOL_TLS_CLIENT)
+    context.set_ciphers("DEFAULT")
+    context.check_hostname = False
+    context.verify_mode = CERT_NONE
+    return context
+
+
+class AlfenConnectionStats:
+    """Count the new and reused connections to the wallbox.
+
+    Every new connection costs a TLS handshake on the embedded web server, a
+    resumed one when the wallbox still knows the session.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the counters."""
+        self.connections = 0
+        self.reused = 0
+
+    @property
+    def reconnects(self) -> int:
+        """Return the number of connections made after the first one."""
+        return max(0, self.connections - 1)
+
+    def get_trace_config(self) -> TraceConfig:
+        """Return a trace config that updates the counters."""
+        trace_config = TraceConfig()
+        trace_config.on_connection_create_end.append(self._on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(self._on_connection_reuseconn)
+        return trace_config
+
+    async def _on_connection_create_end(
+        self,
+        session: ClientSession,
+        context: SimpleNamespace,
+        params: TraceConnectionCreateEndParams,
+    ) -> None:
+        """Count a new connection."""
+        self.connections += 1
+
+    async def _on_connection_reuseconn(
+        self,
+        session: ClientSession,
+        context: SimpleNamespace,
+        params: TraceConnectionReuseconnParams,
+    ) -> None:
+        """Count a reused connection."""
+        self.reused += 1
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters in a JSON serializable format."""
+        return {
+            "connections": self.connections,
+            "reconnects": self.reconnects,
+            "reused": self.reused,
+        }
+
+
+def create_session(
+    ssl: SSLContext, stats: AlfenConnectionStats, keepalive: float
+) -> ClientSession:
+    """Create a session with its own keep-alive connection pool for one wallbox."""
+    connector = TCPConnector(
+        ssl=ssl,
+        limit=CONNECTION_LIMIT,
+        limit_per_host=CONNECTION_LIMIT,
+        keepalive_timeout=keepalive,
+    )
+    return ClientSession(connector=connector, trace_configs=[stats.get_trace_config()])
@@ -3,11 +3,25 @@
 DOMAIN = "alfen_wallbox"
 
 ID = "id"
+IDS = "ids"
 VALUE = "value"
 PROPERTIES = "properties"
 CAT = "cat"
 OFFSET = "offset"
 TOTAL = "total"
+ACCESS = "access"
+TYPE = "type"
+LEN = "len"
+
+# Write flag in the "access" field of a property. The flag is
+# not confirmed on a wallbox yet, the documented responses only show
+# measurements with access 1, so writes are never refused because of it.
+ACCESS_WRITE = 2
+
+# Value types reported in the "type" field of a property
+TYPE_INT = 7
+TYPE_FLOAT = 8
+TYPE_UINT64 = 27
 
 METHOD_POST = "POST"
 METHOD_GET = "GET"
@@ -41,10 +55,36 @@ CAT_TEMP = "temp"
 # CAT_LEDS = "leds"
 # CAT_ACCELERO = "accelero"
 CAT_TRANSACTIONS = "transactions"
+# categories with live measurements, their properties are fetched at every poll
+# even when they did not change for a long time, like the meters of an idle box
+LIVE_CATEGORIES = frozenset((CAT_METER1, CAT_METER2, CAT_METER4, CAT_STATES))
 
 COMMAND_REBOOT = "reboot"
 
+# classes of properties, learned from how often their value changes
+PROPERTY_STATIC = "static"
+PROPERTY_SLOW = "slow"
+PROPERTY_HOT = "hot"
+# slow properties are fetched in one of this many targeted polls, static ones
+# in one of STATIC_POLL_ROUNDS, a multiple so those polls include the slow ones
+SLOW_POLL_ROUNDS = 10
+STATIC_POLL_ROUNDS = 100
+
+# status and mode 3 state property of each socket
+SOCKET_STATE_IDS = (("2501_2", "2501_4"), ("2502_2", "2502_4"))
+STATUS_AVAILABLE = 4
+# mode 3 state A, no vehicle connected
+MODE_3_STATES_NO_VEHICLE = (160, 161, 162)
+
 CONF_REFRESH_CATEGORIES = "refresh_categories"
+CONF_FETCH_CONCURRENCY = "fetch_concurrency"
+CONF_TARGETED_FETCH = "targeted_fetch"
+CONF_IDLE_SCAN_INTERVAL = "idle_scan_interval"
+CONF_STALE_AGE = "stale_age"
+CONF_YIELD_SESSION = "yield_session"
+CONF_FRESHNESS_TARGET = "freshness_target"
+# prefix of the refresh interval options, one per category
+CONF_CATEGORY_INTERVAL = "category_interval"
 
 DEFAULT_REFRESH_CATEGORIES = (
     CAT_COMM,
@@ -75,6 +115,37 @@ CATEGORIES = (
     CAT_TRANSACTIONS,
 )
 
+# order in which the categories are fetched, the live values first, so they make
+# it into a poll that runs out of time
+CATEGORY_PRIORITY = (
+    CAT_STATES,
+    CAT_METER1,
+    CAT_METER2,
+    CAT_METER4,
+    CAT_GENERIC,
+    CAT_GENERIC2,
+    CAT_TEMP,
+    CAT_DISPLAY,
+    CAT_COMM,
+    CAT_OCPP,
+    CAT_MBUS_TCP,
+)
+
+# seconds between the updates of a category, 0 updates it at every scan interval
+DEFAULT_CATEGORY_INTERVALS = {
+    CAT_COMM: 900,
+    CAT_DISPLAY: 900,
+    CAT_GENERIC: 0,
+    CAT_GENERIC2: 0,
+    CAT_MBUS_TCP: 900,
+    CAT_METER1: 0,
+    CAT_METER2: 0,
+    CAT_METER4: 0,
+    CAT_OCPP: 900,
+    CAT_STATES: 0,
+    CAT_TEMP: 60,
+}
+
 # CONF_GENERIC = "get_generic"
 # CONF_GENERIC2 = "get_generic2"
 # CONF_METER1 = "get_meter1"
@@ -88,7 +159,51 @@ CATEGORIES = (
 # CONF_TRANSACTION_DATA = "display"
 
 DEFAULT_SCAN_INTERVAL = 5
+# used while no vehicle is connected to any socket
+DEFAULT_IDLE_SCAN_INTERVAL = 60
 DEFAULT_TIMEOUT = 20
+# the wallbox serves the API from an embedded web server, keep the default low.
+# Provisional: not measured on a wallbox yet, only chosen to be conservative
+DEFAULT_FETCH_CONCURRENCY = 2
+DEFAULT_TARGETED_FETCH = True
+# seconds a category can fail before its entities become unavailable
+DEFAULT_STALE_AGE = 300
+# log out after every poll, so other clients like the installer app can log in
+DEFAULT_YIELD_SESSION = False
+# seconds the values may be old in yield mode, the polls are spaced to match
+DEFAULT_FRESHNESS_TARGET = 60
+
+# attempts of a request, with exponential backoff and jitter in between
+RETRY_ATTEMPTS = 3
+RETRY_BACKOFF = 0.5
+RETRY_MAX_BACKOFF = 8
+# seconds a request may take with all its attempts
+RETRY_DEADLINE = 60
+# seconds an attempt may take at least, a poll gives each attempt an equal
+# share of its budget so a retry fits in the same poll
+RETRY_MIN_TIMEOUT = 2
+
+# the SSL context shared by the wallboxes, it keeps their TLS sessions
+DATA_SSL_CONTEXT = f"{DOMAIN}_ssl_context"
+# part of the learned idle timeout after which an unused session is renewed
+SESSION_RENEW_FACTOR = 0.9
+
+# connections to one wallbox, enough for a request per category and a write
+CONNECTION_LIMIT = 12
+# an idle connection is kept open until the next poll at the slowest interval
+# of the options plus this many seconds, so polls reuse it without a new TLS
+# handshake. It is capped, at longer intervals a handshake per poll is cheap.
+# A connection the wallbox closes earlier is reconnected by the retry policy.
+CONNECTION_KEEPALIVE_MARGIN = 5
+CONNECTION_MAX_KEEPALIVE = 300
+
+# conservative limit for the request line of the embedded web server
+MAX_URL_LENGTH = 1024
+
+CATALOG_STORAGE_VERSION = 1
+CATALOG_SAVE_DELAY = 60
+ACTIVITY_STORAGE_VERSION = 1
+ACTIVITY_SAVE_DELAY = 300
 
 SERVICE_REBOOT_WALLBOX = "reboot_wallbox"
 SERVICE_SET_CURRENT_LIMIT = "set_current_limit"
@@ -99,6 +214,7 @@ SERVICE_ENABLE_PHASE_SWITCHING = "enable_phase_switching"
 SERVICE_DISABLE_PHASE_SWITCHING = "disable_phase_switching"
 SERVICE_SET_GREEN_SHARE = "set_green_share"
 SERVICE_SET_COMFORT_POWER = "set_comfort_power"
+SERVICE_GET_PROPERTY_CATALOG = "get_property_catalog"
 
 ALFEN_PRODUCT_MAP = {
     "NG900-60503": "Eve Single S-line, 1 phase, LED, type 2 socket",
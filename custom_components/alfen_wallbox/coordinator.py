@@ -1,11 +1,11 @@
 """Class representing a Alfen Wallbox update coordinator."""
 
 from asyncio import timeout
-from datetime import timedelta
+from collections.abc import Iterable
+from datetime import datetime, timedelta
 import logging
-from ssl import CERT_NONE
 
-from aiohttp import ClientConnectionError
+from aiohttp import ClientConnectionError, ClientSession
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
@@ -16,19 +16,43 @@ from homeassistant.const import (
     CONF_TIMEOUT,
     CONF_USERNAME,
 )
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
-from homeassistant.util.ssl import get_default_context
 
 from .alfen import AlfenDevice
+from .connection import AlfenConnectionStats, create_session, create_ssl_context
 from .const import (
+    ACTIVITY_SAVE_DELAY,
+    ACTIVITY_STORAGE_VERSION,
+    CAT_TRANSACTIONS,
+    CATALOG_SAVE_DELAY,
+    CATALOG_STORAGE_VERSION,
+    CONF_CATEGORY_INTERVAL,
+    CONF_FETCH_CONCURRENCY,
+    CONF_FRESHNESS_TARGET,
+    CONF_IDLE_SCAN_INTERVAL,
     CONF_REFRESH_CATEGORIES,
+    CONF_STALE_AGE,
+    CONF_TARGETED_FETCH,
+    CONF_YIELD_SESSION,
+    CONNECTION_KEEPALIVE_MARGIN,
+    CONNECTION_MAX_KEEPALIVE,
+    DATA_SSL_CONTEXT,
+    DEFAULT_CATEGORY_INTERVALS,
+    DEFAULT_FETCH_CONCURRENCY,
+    DEFAULT_FRESHNESS_TARGET,
+    DEFAULT_IDLE_SCAN_INTERVAL,
     DEFAULT_REFRESH_CATEGORIES,
     DEFAULT_SCAN_INTERVAL,
+    DEFAULT_STALE_AGE,
+    DEFAULT_TARGETED_FETCH,
     DEFAULT_TIMEOUT,
+    DEFAULT_YIELD_SESSION,
     DOMAIN,
 )
+from .store import AlfenPropertyActivity, AlfenPropertyCatalog
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -53,36 +77,345 @@ class AlfenCoordinator(DataUpdateCoordinator[None]):
         self.hass = hass
         self.device = None
         self.timeout = self.entry.options.get(CONF_TIMEOUT, DEFAULT_TIMEOUT)
+        self._property_listeners: dict[int, dict[CALLBACK_TYPE, None]] = {}
+        self._poll_listeners: dict[CALLBACK_TYPE, None] = {}
+        self._remove_dispatcher: CALLBACK_TYPE | None = None
+        self._last_update_success: bool | None = None
+        # the fetch plan is rebuilt before the next poll when the listeners change
+        self._fetch_ids_changed = True
+        # loop time of the last refresh of each category
+        self._category_fetched: dict[str, float] = {}
+        # poll at the idle interval while no vehicle is connected
+        self._idle = False
+        # loop time until which the scan interval is used after a user write
+        self._fast_until = 0.0
+        # seconds the last poll took, logged in from start to end in yield mode
+        self._burst_duration = 0.0
+        self._catalog_store: Store[dict] = Store(
+            hass, CATALOG_STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.catalog"
+        )
+        self._activity_store: Store[dict] = Store(
+            hass, ACTIVITY_STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.activity"
+        )
+        self._activity_version = 0
+        self._session: ClientSession | None = None
+        self._keepalive = 0.0
+        self._unsub_renew_session: CALLBACK_TYPE | None = None
+        self.connection_stats = AlfenConnectionStats()
 
     async def _async_setup(self):
         """Set up the coordinator."""
-        session = async_get_clientsession(self.hass, verify_ssl=False)
+        # one context for all wallboxes, reconnects resume their TLS session
+        context = self.hass.data.get(DATA_SSL_CONTEXT)
+        if context is None:
+            context = self.hass.data[DATA_SSL_CONTEXT] = create_ssl_context()
 
-        # Default ciphers needed as of python 3.10
-        context = get_default_context()
-
-        context.set_ciphers("DEFAULT")
-        context.check_hostname = False
-        context.verify_mode = CERT_NONE
+        # a connection pool of its own, so polls reuse the TLS connections
+        self._keepalive = self._get_keepalive()
+        self._session = create_session(context, self.connection_stats, self._keepalive)
 
         self.device = AlfenDevice(
-            session,
+            self._session,
             self.entry.data[CONF_HOST],
             self.entry.data[CONF_NAME],
             self.entry.data[CONF_USERNAME],
             self.entry.data[CONF_PASSWORD],
             self.entry.options.get(CONF_REFRESH_CATEGORIES, DEFAULT_REFRESH_CATEGORIES),
             context,
+            self.entry.options.get(CONF_FETCH_CONCURRENCY, DEFAULT_FETCH_CONCURRENCY),
+            self.entry.options.get(CONF_STALE_AGE, DEFAULT_STALE_AGE),
+            self.timeout,
+        )
+        self.device.on_value_set = self._async_handle_value_set
+        self.device.yield_session = self.entry.options.get(
+            CONF_YIELD_SESSION, DEFAULT_YIELD_SESSION
         )
         if not await self.async_connect():
+            await self._session.close()
             raise UpdateFailed("Error communicating with API")
+        await self._async_load_catalog()
+        if (data := await self._activity_store.async_load()) is not None:
+            self.device.activity = AlfenPropertyActivity.from_dict(data)
+
+    async def async_shutdown(self) -> None:
+        """Stop the updates and close the connections to the wallbox."""
+        await super().async_shutdown()
+        if self._unsub_renew_session is not None:
+            self._unsub_renew_session()
+            self._unsub_renew_session = None
+        if self._session is not None:
+            await self._session.close()
+
+    def _get_keepalive(self) -> float:
+        """Return the seconds an idle connection is kept open.
+
+        Long enough to reach the next poll at the slowest interval of the options.
+        """
+        options = self.entry.options
+        interval = options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+        if options.get(CONF_YIELD_SESSION, DEFAULT_YIELD_SESSION):
+            interval = max(
+                interval, options.get(CONF_FRESHNESS_TARGET, DEFAULT_FRESHNESS_TARGET)
+            )
+        else:
+            interval = max(
+                interval,
+                options.get(CONF_IDLE_SCAN_INTERVAL, DEFAULT_IDLE_SCAN_INTERVAL),
+            )
+        return min(interval + CONNECTION_KEEPALIVE_MARGIN, CONNECTION_MAX_KEEPALIVE)
+
+    async def async_update_keepalive(self) -> None:
+        """Replace the session when the options changed the keep-alive.
+
+        Requests in flight on the old session fail and are retried on the new one.
+        """
+        keepalive = self._get_keepalive()
+        if keepalive == self._keepalive:
+            return
+        self._keepalive = keepalive
+        session = self._session
+        self._session = self.device.session = create_session(
+            self.hass.data[DATA_SSL_CONTEXT], self.connection_stats, keepalive
+        )
+        await session.close()
 
     async def _async_update_data(self) -> None:
         """Fetch data from API endpoint."""
 
-        async with timeout(self.timeout):
-            if not await self.device.async_update():
-                raise UpdateFailed("Error updating")
+        if self._fetch_ids_changed:
+            self._fetch_ids_changed = False
+            self.device.set_fetch_ids(
+                self._property_listeners
+                if self.entry.options.get(CONF_TARGETED_FETCH, DEFAULT_TARGETED_FETCH)
+                else None
+            )
+
+        now = self.hass.loop.time()
+        categories = self._get_due_categories(now)
+
+        # the device commits what it fetched within the update budget
+        success = await self.device.async_update(categories)
+        self._burst_duration = self.hass.loop.time() - now
+        self._schedule_session_renewal()
+        if not success:
+            raise UpdateFailed("Error updating")
+
+        self._schedule_categories(categories, now)
+
+        if self.device.catalog.dirty:
+            self.device.catalog.dirty = False
+            self._catalog_store.async_delay_save(
+                self.device.catalog.as_dict, CATALOG_SAVE_DELAY
+            )
+        if self.device.activity.version != self._activity_version:
+            self._activity_version = self.device.activity.version
+            self._activity_store.async_delay_save(
+                self.device.activity.as_dict, ACTIVITY_SAVE_DELAY
+            )
+
+    @callback
+    def _schedule_session_renewal(self) -> None:
+        """Renew the session of the wallbox just before it would expire.
+
+        Every update moves the renewal, it only happens when the updates are
+        further apart than the idle timeout of the wallbox.
+        """
+        if self._unsub_renew_session is not None:
+            self._unsub_renew_session()
+            self._unsub_renew_session = None
+        delay = self.device.auth.get_renew_delay()
+        if delay is not None:
+            self._unsub_renew_session = async_call_later(
+                self.hass, delay, self._async_renew_session
+            )
+
+    async def _async_renew_session(self, _now: datetime) -> None:
+        """Renew the session of the wallbox."""
+        self._unsub_renew_session = None
+        await self.device.async_renew_session()
+        self._schedule_session_renewal()
+
+    def _get_scan_interval(self, now: float) -> float:
+        """Return the seconds between the updates of the fast categories.
+
+        The idle interval is used while no vehicle is connected, unless a value
+        was set by the user recently. In yield mode the polls are spaced so the
+        values are never older than the freshness target.
+        """
+        scan_interval = self.entry.options.get(
+            CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL
+        )
+        if self.device.yield_session:
+            freshness_target = self.entry.options.get(
+                CONF_FRESHNESS_TARGET, DEFAULT_FRESHNESS_TARGET
+            )
+            return max(freshness_target - self._burst_duration, scan_interval)
+        if self._idle and now >= self._fast_until:
+            return max(
+                self.entry.options.get(
+                    CONF_IDLE_SCAN_INTERVAL, DEFAULT_IDLE_SCAN_INTERVAL
+                ),
+                scan_interval,
+            )
+        return scan_interval
+
+    def _get_category_interval(self, category: str, scan_interval: float) -> float:
+        """Return the seconds between the updates of a category."""
+        interval = self.entry.options.get(
+            f"{CONF_CATEGORY_INTERVAL}_{category}",
+            DEFAULT_CATEGORY_INTERVALS.get(category, 0),
+        )
+        return max(interval, scan_interval)
+
+    def _get_category_due(self, now: float) -> dict[str, float]:
+        """Return the loop time at which each category is due for a refresh."""
+        scan_interval = self._get_scan_interval(now)
+        category_due: dict[str, float] = {}
+        for category in self.device.category_options:
+            if category == CAT_TRANSACTIONS:
+                continue
+            fetched = self._category_fetched.get(category)
+            category_due[category] = (
+                now
+                if fetched is None
+                else fetched + self._get_category_interval(category, scan_interval)
+            )
+        return category_due
+
+    def _get_due_categories(self, now: float) -> list[str]:
+        """Return the categories that are due for a refresh.
+
+        Categories that become due within half a scan interval are refreshed in
+        the same round, instead of waking up again shortly after. In yield mode
+        everything that is due before the next poll is fetched in this one, so
+        the wallbox is free between the polls.
+        """
+        margin = self._get_scan_interval(now)
+        if not self.device.yield_session:
+            margin /= 2
+        return [
+            category
+            for category, due in self._get_category_due(now).items()
+            if due <= now + margin
+        ]
+
+    def _schedule_categories(self, categories: list[str], now: float) -> None:
+        """Mark the categories as refreshed and wake up at the first one due.
+
+        Categories that failed or were deferred stay due and are fetched in the
+        next round.
+        """
+        retry = self.device.failed_categories | self.device.deferred_categories
+        for category in categories:
+            if category not in retry:
+                self._category_fetched[category] = now
+
+        idle = self.device.is_idle()
+        if idle != self._idle:
+            _LOGGER.debug("Wallbox is %s", "idle" if idle else "in use")
+            self._idle = idle
+
+        if self.device.yield_session:
+            scan_interval = self._get_scan_interval(now)
+        else:
+            scan_interval = self.entry.options.get(
+                CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL
+            )
+        due = self._get_category_due(now).values()
+        self.update_interval = timedelta(
+            seconds=max(min(due, default=now) - now, scan_interval)
+        )
+
+    @callback
+    def _async_handle_value_set(self) -> None:
+        """Poll at the scan interval again after a user write."""
+        now = self.hass.loop.time()
+        was_slow = self._get_scan_interval(now) > self.entry.options.get(
+            CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL
+        )
+        self._fast_until = now + self.entry.options.get(
+            CONF_IDLE_SCAN_INTERVAL, DEFAULT_IDLE_SCAN_INTERVAL
+        )
+        if was_slow and not self.device.yield_session:
+            # the next poll can be an idle interval away, reschedule it now
+            self.hass.async_create_task(self.async_request_refresh())
+
+    async def _async_load_catalog(self) -> None:
+        """Load the property catalog of the current firmware version."""
+        firmware_version = self.device.info.firmware_version
+        data = await self._catalog_store.async_load()
+        if data is not None and data.get("firmware_version") == firmware_version:
+            self.device.catalog = AlfenPropertyCatalog.from_dict(data)
+        else:
+            # the properties can change with the firmware, start over
+            self.device.catalog = AlfenPropertyCatalog(firmware_version)
+
+    @callback
+    def async_add_property_listener(
+        self, update_callback: CALLBACK_TYPE, api_params: Iterable[int] | None
+    ) -> CALLBACK_TYPE:
+        """Listen for changes of the given property keys.
+
+        With api_params None the callback is called after every poll.
+        """
+        if self._remove_dispatcher is None:
+            self._remove_dispatcher = self.async_add_listener(
+                self._async_dispatch_property_updates
+            )
+
+        api_params = None if api_params is None else tuple(api_params)
+        if api_params is None:
+            self._poll_listeners[update_callback] = None
+        else:
+            for api_param in api_params:
+                self._property_listeners.setdefault(api_param, {})[update_callback] = (
+                    None
+                )
+            self._fetch_ids_changed = True
+
+        @callback
+        def remove_listener() -> None:
+            """Remove the property listener."""
+            if api_params is None:
+                self._poll_listeners.pop(update_callback, None)
+            else:
+                for api_param in api_params:
+                    listeners = self._property_listeners.get(api_param)
+                    if listeners is None:
+                        continue
+                    listeners.pop(update_callback, None)
+                    if not listeners:
+                        del self._property_listeners[api_param]
+                        self._fetch_ids_changed = True
+            if (
+                not self._property_listeners
+                and not self._poll_listeners
+                and self._remove_dispatcher is not None
+            ):
+                self._remove_dispatcher()
+                self._remove_dispatcher = None
+
+        return remove_listener
+
+    @callback
+    def _async_dispatch_property_updates(self) -> None:
+        """Call the listeners of the properties that changed since the last call."""
+        if self.last_update_success != self._last_update_success:
+            # availability changed, every entity has to write its state
+            self._last_update_success = self.last_update_success
+            update_callbacks = dict(self._poll_listeners)
+            for listeners in self._property_listeners.values():
+                update_callbacks.update(listeners)
+        else:
+            update_callbacks = dict(self._poll_listeners)
+            for api_param in self.device.changed_properties:
+                listeners = self._property_listeners.get(api_param)
+                if listeners is not None:
+                    update_callbacks.update(listeners)
+        self.device.changed_properties = set()
+
+        for update_callback in update_callbacks:
+            update_callback()
 
     async def async_connect(self) -> bool:
         """Connect to the API endpoint."""
@@ -109,14 +442,27 @@ class AlfenCoordinator(DataUpdateCoordinator[None]):
             return False
 
 
-async def options_update_listener(entry: AlfenConfigEntry):
+async def options_update_listener(hass: HomeAssistant, entry: AlfenConfigEntry):
     """Handle options update."""
     coordinator = entry.runtime_data
     coordinator.device.get_static_properties = True
     coordinator.device.category_options = entry.options.get(
         CONF_REFRESH_CATEGORIES, DEFAULT_REFRESH_CATEGORIES
     )
+    coordinator.device.fetch_concurrency = entry.options.get(
+        CONF_FETCH_CONCURRENCY, DEFAULT_FETCH_CONCURRENCY
+    )
+    coordinator.device.stale_age = entry.options.get(CONF_STALE_AGE, DEFAULT_STALE_AGE)
+    coordinator.device.yield_session = entry.options.get(
+        CONF_YIELD_SESSION, DEFAULT_YIELD_SESSION
+    )
+    coordinator.timeout = entry.options.get(CONF_TIMEOUT, DEFAULT_TIMEOUT)
+    coordinator.device.set_timeout(coordinator.timeout)
+    await coordinator.async_update_keepalive()
+    coordinator._fetch_ids_changed = True
+    coordinator._category_fetched.clear()
 
     coordinator.update_interval = timedelta(
         seconds=entry.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
     )
+    await coordinator.async_request_refresh()
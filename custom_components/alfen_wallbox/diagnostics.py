@@ -19,9 +19,25 @@ async def async_get_config_entry_diagnostics(
         "name": device.name,
         "info": vars(device.info),
         "keep_logout": device.keep_logout,
+        "yield_session": device.yield_session,
         "max_allowed_phases": device.max_allowed_phases,
         "number_socket": device.get_number_of_sockets(),
         "licenses": device.get_licenses(),
         "category_options": device.category_options,
-        "properties": device.properties,
+        "category_updated": {
+            category: updated.isoformat()
+            for category, updated in device.category_updated.items()
+        },
+        "stale_categories": {
+            category: since.isoformat()
+            for category, since in device.stale_categories.items()
+        },
+        "expired_categories": sorted(device.expired_categories),
+        "last_reached": (
+            None if device.last_reached is None else device.last_reached.isoformat()
+        ),
+        "session": device.auth.as_dict(),
+        "retry_policy": device.retry_policy.as_dict(),
+        "connections": entry.runtime_data.connection_stats.as_dict(),
+        "properties": [prop.as_dict() for prop in device.properties.values()],
     }
@@ -1,20 +1,31 @@
 """Base entity for Alfen Wallbox integration."""
 
-from homeassistant.helpers.entity import DeviceInfo, Entity
+from collections.abc import Hashable
+from typing import Any
+
+from homeassistant.core import callback
+from homeassistant.helpers.entity import DeviceInfo, Entity, EntityDescription
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN as ALFEN_DOMAIN
 from .coordinator import AlfenConfigEntry, AlfenCoordinator
+from .store import AlfenProperty, property_key
 
 
 class AlfenEntity(CoordinatorEntity[AlfenCoordinator], Entity):
     """Define a base Alfen entity."""
 
-    def __init__(self, entry: AlfenConfigEntry) -> None:
+    def __init__(self, entry: AlfenConfigEntry, description: EntityDescription) -> None:
         """Initialize the Alfen entity."""
 
         super().__init__(entry)
         self.coordinator = entry.runtime_data
+        self.entity_description = description
+        api_param = getattr(description, "api_param", None)
+        self._api_key = None if api_param is None else property_key(api_param)
+        self._generation: Hashable = None
+        # set when the category of the property failed for longer than the stale age
+        self._expired = False
 
         self._attr_device_info = DeviceInfo(
             identifiers={(ALFEN_DOMAIN, self.coordinator.device.name)},
@@ -25,5 +36,85 @@ class AlfenEntity(CoordinatorEntity[AlfenCoordinator], Entity):
         )
 
     async def async_added_to_hass(self) -> None:
-        """Add listener for state changes."""
-        await super().async_added_to_hass()
+        """Add listener for changes of the properties of this entity."""
+        # skip the CoordinatorEntity listener, the coordinator dispatches per property
+        await super(CoordinatorEntity, self).async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.async_add_property_listener(
+                self._handle_coordinator_update, self._get_api_params()
+            )
+        )
+
+    def _get_api_params(self) -> tuple[int, ...] | None:
+        """Return the keys of the properties this entity depends on.
+
+        None means that the entity is updated after every poll.
+        """
+        depends_on = getattr(self.entity_description, "depends_on", None)
+        if depends_on is not None:
+            return tuple(property_key(api_param) for api_param in depends_on)
+        if self._api_key is not None:
+            return (self._api_key,)
+        return None
+
+    def _get_generation(self) -> Hashable:
+        """Return the generation of the properties this entity depends on.
+
+        A category that becomes stale or fresh again changes the generation too.
+        """
+        device = self.coordinator.device
+        properties = device.properties
+        api_params = self._get_api_params()
+        if api_params is None:
+            return (properties.generation, device.stale_version)
+        return (
+            tuple(
+                None if (prop := properties.get(key)) is None else prop.generation
+                for key in api_params
+            ),
+            device.stale_version,
+        )
+
+    def _is_expired(self) -> bool:
+        """Return True if the category of the property failed for too long."""
+        if self._api_key is None:
+            return False
+        prop = self.coordinator.device.properties.get(self._api_key)
+        return (
+            prop is not None
+            and prop.category in self.coordinator.device.expired_categories
+        )
+
+    def _get_property_attributes(
+        self, prop: AlfenProperty | None
+    ) -> dict[str, Any] | None:
+        """Return the state attributes of the property of this entity."""
+        if prop is None:
+            return None
+        if prop.category in self.coordinator.device.stale_categories:
+            return {"category": prop.category, "stale": True}
+        return {"category": prop.category}
+
+    @property
+    def available(self) -> bool:
+        """Return True if entity is available."""
+        return super().available and not self._expired
+
+    @callback
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the properties."""
+
+    @callback
+    def _async_refresh_attrs(self) -> None:
+        """Update the entity attributes if a dependency has a newer generation."""
+        generation = self._get_generation()
+        if generation != self._generation:
+            self._generation = generation
+            self._expired = self._is_expired()
+            self._async_update_attrs()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle a change of the properties of this entity."""
+        self._async_refresh_attrs()
+        self.async_write_ha_state()
@@ -19,13 +19,11 @@ from homeassistant.const import (
     UnitOfPower,
     UnitOfTime,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import config_validation as cv, entity_platform
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import (
-    CAT,
-    ID,
     LICENSE_HIGH_POWER,
     SERVICE_SET_COMFORT_POWER,
     SERVICE_SET_CURRENT_LIMIT,
@@ -53,6 +51,9 @@ class AlfenNumberDescriptionMixin:
 class AlfenNumberDescription(NumberEntityDescription, AlfenNumberDescriptionMixin):
     """Class to describe an Alfen select entity."""
 
+    # declared here, a default in the mixin would come before the key field
+    depends_on: tuple[str, ...] | None = None
+
 
 ALFEN_NUMBER_TYPES: Final[tuple[AlfenNumberDescription, ...]] = (
     AlfenNumberDescription(
@@ -144,6 +145,7 @@ ALFEN_NUMBER_TYPES: Final[tuple[AlfenNumberDescription, ...]] = (
         unit_of_measurement=UnitOfPower.WATT,
         api_param="3280_3",
         round_digits=None,
+        depends_on=("3280_3", "2189_0"),
     ),
     AlfenNumberDescription(
         key="dp_light_intensity",
@@ -525,7 +527,7 @@ class AlfenNumber(AlfenEntity, NumberEntity):
         description: AlfenNumberDescription,
     ) -> None:
         """Initialize the Alfen Number entity."""
-        super().__init__(entry)
+        super().__init__(entry, description)
         self._attr_name = f"{description.name}"
         self._attr_unique_id = f"{self.coordinator.device.id}_{description.key}"
         self._attr_assumed_state = description.assumed_state
@@ -539,7 +541,6 @@ class AlfenNumber(AlfenEntity, NumberEntity):
             self._attr_mode = description.custom_mode
         self._attr_native_unit_of_measurement = description.unit_of_measurement
         self._attr_native_value = description.state
-        self.entity_description = description
 
         if description.native_min_value is not None:
             self._attr_min_value = description.native_min_value
@@ -559,10 +560,14 @@ class AlfenNumber(AlfenEntity, NumberEntity):
                 self._attr_max_value = 40
                 self._attr_native_max_value = 40
 
-    @property
-    def native_value(self) -> float | None:
-        """Return the entity value to represent the entity state."""
-        return self._get_current_option()
+        self._async_refresh_attrs()
+
+    @callback
+    def _async_update_attrs(self) -> None:
+        """Update number attributes."""
+        self._attr_native_value = self._get_current_option()
+        prop = self.coordinator.device.properties.get(self._api_key)
+        self._attr_extra_state_attributes = self._get_property_attributes(prop)
 
     async def async_set_native_value(self, value: float) -> None:
         """Update the current value."""
@@ -577,40 +582,32 @@ class AlfenNumber(AlfenEntity, NumberEntity):
             )
         self._set_current_option()
 
-    @property
-    def extra_state_attributes(self):
-        """Return the default attributes of the element."""
-        for prop in self.coordinator.device.properties:
-            if prop[ID] == self.entity_description.api_param:
-                return {"category": prop[CAT]}
-        return None
-
     def _get_current_option(self) -> str | None:
         """Return the current option."""
-        for prop in self.coordinator.device.properties:
-            if prop[ID] == self.entity_description.api_param:
-                _LOGGER.debug("%s Value: %s", self.entity_description.name, prop[VALUE])
-
-                if self.entity_description.round_digits is not None:
-                    return round(prop[VALUE], self.entity_description.round_digits)
-
-                # change comfort level depends on max allowed phase
-                if self.entity_description.key == "lb_solar_charging_comfort_level":
-                    if self.coordinator.device.max_allowed_phases == 3:
-                        self._attr_max_value = self.entity_description.native_max_value
-                        self._attr_native_max_value = (
-                            self.entity_description.native_max_value
-                        )
-                    else:
-                        self._attr_max_value = 3300
-                        self._attr_native_max_value = 3300
-
-                return prop[VALUE]
+        prop = self.coordinator.device.properties.get(self._api_key)
+        if prop is not None:
+            _LOGGER.debug("%s Value: %s", self.entity_description.name, prop.value)
+
+            if self.entity_description.round_digits is not None:
+                return round(prop.value, self.entity_description.round_digits)
+
+            # change comfort level depends on max allowed phase
+            if self.entity_description.key == "lb_solar_charging_comfort_level":
+                if self.coordinator.device.get_property_value("2189_0") == 3:
+                    self._attr_max_value = self.entity_description.native_max_value
+                    self._attr_native_max_value = (
+                        self.entity_description.native_max_value
+                    )
+                else:
+                    self._attr_max_value = 3300
+                    self._attr_native_max_value = 3300
+
+            return prop.value
         return None
 
     def _set_current_option(self):
         """Set the current option."""
-        self._attr_native_value = self._get_current_option()
+        self._async_refresh_attrs()
         self.async_write_ha_state()
 
     async def async_set_current_limit(self, limit):
@@ -0,0 +1,73 @@
+"""Retry policy for the requests to the Alfen Wallbox API."""
+
+from __future__ import annotations
+
+import random
+from typing import Any
+
+from .const import (
+    DEFAULT_TIMEOUT,
+    RETRY_ATTEMPTS,
+    RETRY_BACKOFF,
+    RETRY_DEADLINE,
+    RETRY_MAX_BACKOFF,
+)
+
+
+class AlfenRetryPolicy:
+    """Exponential backoff with full jitter, bounded by an overall deadline.
+
+    The wallbox serves the API from an embedded web server, spreading the
+    retries over time gives it room to recover instead of adding to the load.
+    """
+
+    def __init__(
+        self,
+        timeout: float = DEFAULT_TIMEOUT,
+        attempts: int = RETRY_ATTEMPTS,
+        backoff: float = RETRY_BACKOFF,
+        max_backoff: float = RETRY_MAX_BACKOFF,
+        deadline: float = RETRY_DEADLINE,
+    ) -> None:
+        """Initialize the retry policy."""
+        # seconds a single attempt may take
+        self.timeout = timeout
+        self.attempts = attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.deadline = deadline
+        # counters, exposed in the diagnostics
+        self.requests = 0
+        self.retries = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.unauthorized = 0
+        self.failures = 0
+
+    def get_timeout(self, remaining: float) -> float:
+        """Return the timeout of an attempt with the remaining time of a request."""
+        return max(0.0, min(self.timeout, remaining))
+
+    def get_delay(self, attempt: int) -> float:
+        """Return the delay before the retry of the given failed attempt."""
+        return random.uniform(
+            0, min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+        )
+
+    def should_retry(self, attempt: int, delay: float, remaining: float) -> bool:
+        """Return True if another attempt fits in the attempts and the deadline."""
+        return attempt < self.attempts and delay < remaining
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the settings and counters in a JSON serializable format."""
+        return {
+            "timeout": self.timeout,
+            "attempts": self.attempts,
+            "deadline": self.deadline,
+            "requests": self.requests,
+            "retries": self.retries,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+            "unauthorized": self.unauthorized,
+            "failures": self.failures,
+        }
@@ -11,12 +11,9 @@ from homeassistant.helpers import entity_platform
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import (
-    CAT,
-    ID,
     SERVICE_DISABLE_RFID_AUTHORIZATION_MODE,
     SERVICE_ENABLE_RFID_AUTHORIZATION_MODE,
     SERVICE_SET_CURRENT_PHASE,
-    VALUE,
 )
 from .coordinator import AlfenConfigEntry
 from .entity import AlfenEntity
@@ -339,14 +336,13 @@ class AlfenSelect(AlfenEntity, SelectEntity):
         self, entry: AlfenConfigEntry, description: AlfenSelectDescription
     ) -> None:
         """Initialize."""
-        super().__init__(entry)
+        super().__init__(entry, description)
         self._attr_name = f"{self.coordinator.device.name} {description.name}"
 
         self._attr_unique_id = f"{self.coordinator.device.id}_{description.key}"
         self._attr_options = description.options
-        self.entity_description = description
         self.values_dict = {v: k for k, v in description.options_dict.items()}
-        self._async_update_attrs()
+        self._async_refresh_attrs()
 
     async def async_select_option(self, option: str) -> None:
         """Change the selected option."""
@@ -355,39 +351,28 @@ class AlfenSelect(AlfenEntity, SelectEntity):
         await self.coordinator.device.set_value(
             self.entity_description.api_param, value
         )
+        self._async_refresh_attrs()
         self.async_write_ha_state()
 
-    @property
-    def current_option(self) -> str | None:
-        """Return the current option."""
-        value = self._get_current_option()
-        return self.values_dict.get(value)
-
-    @property
-    def extra_state_attributes(self):
-        """Return the default attributes of the element."""
-        for prop in self.coordinator.device.properties:
-            if prop[ID] == self.entity_description.api_param:
-                return {"category": prop[CAT]}
-        return None
-
     def _get_current_option(self) -> str | None:
         """Return the current option."""
-        for prop in self.coordinator.device.properties:
-            if prop[ID] == self.entity_description.api_param:
-                if self.entity_description.key == "ps_installation_max_allowed_phase":
-                    self.coordinator.device.max_allowed_phases = prop[VALUE]
-                return prop[VALUE]
+        prop = self.coordinator.device.properties.get(self._api_key)
+        if prop is not None:
+            if self.entity_description.key == "ps_installation_max_allowed_phase":
+                self.coordinator.device.max_allowed_phases = prop.value
+            return prop.value
         return None
 
     async def async_update(self):
         """Update the entity."""
-        self._async_update_attrs()
+        self._async_refresh_attrs()
 
     @callback
     def _async_update_attrs(self) -> None:
         """Update select attributes."""
-        self._attr_current_option = self._get_current_option()
+        self._attr_current_option = self.values_dict.get(self._get_current_option())
+        prop = self.coordinator.device.properties.get(self._api_key)
+        self._attr_extra_state_attributes = self._get_property_attributes(prop)
 
     async def async_set_current_phase(self, phase):
         """Set the current phase."""
@@ -398,10 +383,12 @@ class AlfenSelect(AlfenEntity, SelectEntity):
         """Enable RFID authorization mode."""
         await self.coordinator.device.set_rfid_auth_mode(True)
         await self.coordinator.device.set_value(self.entity_description.api_param, 2)
+        self._async_refresh_attrs()
         self.async_write_ha_state()
 
     async def async_disable_rfid_auth_mode(self):
         """Disable RFID authorization mode."""
         await self.coordinator.device.set_rfid_auth_mode(False)
         await self.coordinator.device.set_value(self.entity_description.api_param, 0)
+        self._async_refresh_attrs()
         self.async_write_ha_state()
@@ -1,5 +1,6 @@
 """Support for Alfen Eve Single Proline Wallbox."""
 
+from collections.abc import Hashable
 from dataclasses import dataclass
 import datetime
 from typing import Final
@@ -21,13 +22,18 @@ from homeassistant.const import (
     UnitOfTemperature,
     UnitOfTime,
 )
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
 from homeassistant.helpers import entity_platform
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import StateType
 
-from .const import CAT, ID, SERVICE_REBOOT_WALLBOX, VALUE
+from .const import SERVICE_GET_PROPERTY_CATALOG, SERVICE_REBOOT_WALLBOX
 from .coordinator import AlfenConfigEntry
 from .entity import AlfenEntity
 
@@ -45,6 +51,9 @@ class AlfenSensorDescriptionMixin:
 class AlfenSensorDescription(SensorEntityDescription, AlfenSensorDescriptionMixin):
     """Class to describe an Alfen sensor entity."""
 
+    # declared here, a default in the mixin would come before the key field
+    depends_on: tuple[str, ...] | None = None
+
 
 STATUS_DICT: Final[dict[int, str]] = {
     0: "Unknown",
@@ -938,6 +947,7 @@ ALFEN_SENSOR_TYPES: Final[tuple[AlfenSensorDescription, ...]] = (
         name="Smart Meter Power L1",
         icon="mdi:transmission-tower",
         api_param=None,
+        depends_on=("5221_3", "212F_1"),
         unit=UnitOfPower.WATT,
         round_digits=2,
         state_class=SensorStateClass.MEASUREMENT,
@@ -948,6 +958,7 @@ ALFEN_SENSOR_TYPES: Final[tuple[AlfenSensorDescription, ...]] = (
         name="Smart Meter Power L2",
         icon="mdi:transmission-tower",
         api_param=None,
+        depends_on=("5221_4", "212F_2"),
         unit=UnitOfPower.WATT,
         round_digits=2,
         state_class=SensorStateClass.MEASUREMENT,
@@ -958,6 +969,7 @@ ALFEN_SENSOR_TYPES: Final[tuple[AlfenSensorDescription, ...]] = (
         name="Smart Meter Power L3",
         icon="mdi:transmission-tower",
         api_param=None,
+        depends_on=("5221_5", "212F_3"),
         unit=UnitOfPower.WATT,
         round_digits=2,
         state_class=SensorStateClass.MEASUREMENT,
@@ -968,6 +980,14 @@ ALFEN_SENSOR_TYPES: Final[tuple[AlfenSensorDescription, ...]] = (
         name="Smart Meter Power Total",
         icon="mdi:transmission-tower",
         api_param=None,
+        depends_on=(
+            "5221_3",
+            "5221_4",
+            "5221_5",
+            "212F_1",
+            "212F_2",
+            "212F_3",
+        ),
         unit=UnitOfPower.WATT,
         round_digits=2,
         state_class=SensorStateClass.MEASUREMENT,
@@ -1524,6 +1544,13 @@ async def async_setup_entry(
         "async_reboot_wallbox",
     )
 
+    platform.async_register_entity_service(
+        SERVICE_GET_PROPERTY_CATALOG,
+        {},
+        "async_get_property_catalog",
+        supports_response=SupportsResponse.ONLY,
+    )
+
 
 class AlfenMainSensor(AlfenEntity):
     """Representation of a Alfen Main Sensor."""
@@ -1534,10 +1561,11 @@ class AlfenMainSensor(AlfenEntity):
         self, entry: AlfenConfigEntry, description: AlfenSensorDescription
     ) -> None:
         """Initialize the sensor."""
-        super().__init__(entry)
+        super().__init__(entry, description)
 
         self._sensor = "sensor"
-        self.entity_description = description
+        self._state = "Unknown"
+        self._async_refresh_attrs()
 
     @property
     def unique_id(self):
@@ -1552,35 +1580,43 @@ class AlfenMainSensor(AlfenEntity):
     @property
     def state(self):
         """Return the state of the sensor."""
-        for prop in self.coordinator.device.properties:
-            if prop[ID] == self.entity_description.api_param:
-                # exception
-                # status only from socket 1
-                if prop[ID] == "2501_2":
-                    return STATUS_DICT.get(prop[VALUE], "Unknown")
+        return self._state
 
-                if self.entity_description.round_digits is not None:
-                    return round(prop[VALUE], self.entity_description.round_digits)
+    def _compute_state(self):
+        """Compute the state of the sensor from the properties."""
+        prop = self.coordinator.device.properties.get(self._api_key)
+        if prop is not None:
+            # exception
+            # status only from socket 1
+            if prop.id == "2501_2":
+                return STATUS_DICT.get(prop.value, "Unknown")
 
-                return prop[VALUE]
+            if self.entity_description.round_digits is not None:
+                return round(prop.value, self.entity_description.round_digits)
+
+            return prop.value
 
         return "Unknown"
 
-    @property
-    def extra_state_attributes(self):
-        """Return the default attributes of the element."""
-        for prop in self.coordinator.device.properties:
-            if prop[ID] == self.entity_description.api_param:
-                return {"category": prop[CAT]}
-        return None
+    @callback
+    def _async_update_attrs(self) -> None:
+        """Update the state and attributes."""
+        self._state = self._compute_state()
+        prop = self.coordinator.device.properties.get(self._api_key)
+        self._attr_extra_state_attributes = self._get_property_attributes(prop)
 
     async def async_reboot_wallbox(self):
         """Reboot the wallbox."""
         await self.coordinator.device.reboot_wallbox()
 
+    async def async_get_property_catalog(self) -> ServiceResponse:
+        """Return the metadata of the properties of the wallbox."""
+        return self.coordinator.device.catalog.as_dict()
+
     async def async_update(self):
         """Update the sensor."""
         await self.coordinator.device.async_update()
+        self._async_refresh_attrs()
 
     @property
     def device_info(self):
@@ -1597,29 +1633,30 @@ class AlfenSensor(AlfenEntity, SensorEntity):
         self, entry: AlfenConfigEntry, description: AlfenSensorDescription
     ) -> None:
         """Initialize the sensor."""
-        super().__init__(entry)
+        super().__init__(entry, description)
 
         self._attr_name = f"{self.coordinator.device.name} {description.name}"
         self._attr_unique_id = f"{self._attr_unique_id}-{description.key}"
-        self.entity_description = description
         if description.state_class is not None:
             self._attr_state_class = description.state_class
         if description.device_class is not None:
             self._attr_device_class = description.device_class
 
-        self._async_update_attrs()
+        self._async_refresh_attrs()
 
-    def _get_current_value(self) -> StateType | None:
-        """Get the current value."""
-        for prop in self.coordinator.device.properties:
-            if prop[ID] == self.entity_description.api_param:
-                return prop[VALUE]
-        return None
+    def _get_generation(self) -> Hashable:
+        """Return the generation of the properties this sensor depends on."""
+        if self._get_api_params() is None:
+            # custom sensors are computed from the transactions
+            return self.coordinator.device.transaction_generation
+        return super()._get_generation()
 
     @callback
     def _async_update_attrs(self) -> None:
         """Update the state and attributes."""
-        self._attr_native_value = self._get_current_value()
+        self._attr_native_value = self._compute_state()
+        prop = self.coordinator.device.properties.get(self._api_key)
+        self._attr_extra_state_attributes = self._get_property_attributes(prop)
 
     @property
     def unique_id(self) -> str:
@@ -1822,40 +1859,43 @@ class AlfenSensor(AlfenEntity, SensorEntity):
         return None
 
     @property
-    def state(self) -> StateType:  # noqa: C901
+    def state(self) -> StateType:
         """Return the state of the sensor."""
+        return self._attr_native_value
+
+    def _get_float_value(self, api_param: str) -> float | None:
+        """Return the value of a property as a float, None if it is not a number.
+
+        Only the known value types are decoded, others stay the raw API string.
+        """
+        value = self.coordinator.device.get_property_value(api_param)
+        if value is None:
+            return None
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return None
+
+    def _compute_state(self) -> StateType:  # noqa: C901
+        """Compute the state of the sensor from the properties."""
         # state of none Api param
         if self.entity_description.api_param is None:
-            voltage_l1 = None
-            voltage_l2 = None
-            voltage_l3 = None
-            current_l1 = None
-            current_l2 = None
-            current_l3 = None
-
-            for prop in self.coordinator.device.properties:
-                if prop[ID] == "5221_3":
-                    voltage_l1 = prop[VALUE]
-                if prop[ID] == "5221_4":
-                    voltage_l2 = prop[VALUE]
-                if prop[ID] == "5221_5":
-                    voltage_l3 = prop[VALUE]
-                if prop[ID] == "212F_1":
-                    current_l1 = prop[VALUE]
-                if prop[ID] == "212F_2":
-                    current_l2 = prop[VALUE]
-                if prop[ID] == "212F_3":
-                    current_l3 = prop[VALUE]
+            voltage_l1 = self._get_float_value("5221_3")
+            voltage_l2 = self._get_float_value("5221_4")
+            voltage_l3 = self._get_float_value("5221_5")
+            current_l1 = self._get_float_value("212F_1")
+            current_l2 = self._get_float_value("212F_2")
+            current_l3 = self._get_float_value("212F_3")
 
             if self.entity_description.key == "smart_meter_l1":
                 if voltage_l1 is not None and current_l1 is not None:
-                    return round(float(voltage_l1) * float(current_l1), 2)
+                    return round(voltage_l1 * current_l1, 2)
             if self.entity_description.key == "smart_meter_l2":
                 if voltage_l2 is not None and current_l2 is not None:
-                    return round(float(voltage_l2) * float(current_l2), 2)
+                    return round(voltage_l2 * current_l2, 2)
             if self.entity_description.key == "smart_meter_l3":
                 if voltage_l3 is not None and current_l3 is not None:
-                    return round(float(voltage_l3) * float(current_l3), 2)
+                    return round(voltage_l3 * current_l3, 2)
             if self.entity_description.key == "smart_meter_total":
                 if (
                     voltage_l1 is not None
@@ -1867,9 +1907,9 @@ class AlfenSensor(AlfenEntity, SensorEntity):
                 ):
                     return round(
                         (
-                            float(voltage_l1) * float(current_l1)
-                            + float(voltage_l2) * float(current_l2)
-                            + float(voltage_l3) * float(current_l3)
+                            voltage_l1 * current_l1
+                            + voltage_l2 * current_l2
+                            + voltage_l3 * current_l3
                         ),
                         2,
                     )
@@ -1880,103 +1920,82 @@ class AlfenSensor(AlfenEntity, SensorEntity):
             if value is not None:
                 return value
 
-        for prop in self.coordinator.device.properties:
-            if prop[ID] == self.entity_description.api_param:
-                # some exception of return value
-
-                # Display state status
-                if self.entity_description.api_param in ("3190_1", "3191_1"):
-                    if prop[VALUE] == 28:
-                        return "See error Number"
+        prop = self.coordinator.device.properties.get(self._api_key)
+        if prop is not None:
+            # some exception of return value
 
-                    return STATUS_DICT.get(prop[VALUE], "Unknown")
+            # Display state status
+            if self.entity_description.api_param in ("3190_1", "3191_1"):
+                if prop.value == 28:
+                    return "See error Number"
 
-                # meter_reading from w to kWh
-                if self.entity_description.api_param in ("2221_22", "3221_22"):
-                    return round((prop[VALUE] / 1000), 2)
+                return STATUS_DICT.get(prop.value, "Unknown")
 
-                # Car PWM Duty cycle %
-                if self.entity_description.api_param == "2511_3":
-                    return round(
-                        (prop[VALUE] / 100), self.entity_description.round_digits
-                    )
-
-                # change milliseconds to HH:MM:SS
-                if self.entity_description.key == "uptime":
-                    return str(datetime.timedelta(milliseconds=prop[VALUE])).split(
-                        ".", maxsplit=1
-                    )[0]
-
-                if self.entity_description.key == "uptime_hours":
-                    result = 0
-                    value = str(datetime.timedelta(milliseconds=prop[VALUE]))
-                    days = value.split(" day")
-                    if len(days) > 1:
-                        result = int(days[0]) * 24
-                        hours = days[1].split(", ")[1].split(":", maxsplit=1)[0]
-                    else:
-                        hours = value.split(":", maxsplit=1)[0]
-                    result += int(hours)
-                    return result
-
-                # change milliseconds to d/m/y HH:MM:SS
-                if self.entity_description.api_param in ("2187_0", "2059_0"):
-                    return datetime.datetime.fromtimestamp(prop[VALUE] / 1000).strftime(
-                        "%d/%m/%Y %H:%M:%S"
-                    )
+            # meter_reading from w to kWh
+            if self.entity_description.api_param in ("2221_22", "3221_22"):
+                return round((prop.value / 1000), 2)
 
-                # Allowed phase 1 or Allowed Phase 2
-                if (self.entity_description.api_param == "312E_0") | (
-                    self.entity_description.api_param == "312F_0"
-                ):
-                    return ALLOWED_PHASE_DICT.get(prop[VALUE], "Unknown")
-
-                if self.entity_description.round_digits is not None:
-                    return round(prop[VALUE], self.entity_description.round_digits)
+            # Car PWM Duty cycle %
+            if self.entity_description.api_param == "2511_3":
+                return round((prop.value / 100), self.entity_description.round_digits)
 
-                # mode3_state
-                if self.entity_description.api_param in ("2501_4", "2502_4"):
-                    return MODE_3_STAT_DICT.get(prop[VALUE], "Unknown")
+            # change milliseconds to HH:MM:SS
+            if self.entity_description.key == "uptime":
+                return str(datetime.timedelta(milliseconds=prop.value)).split(
+                    ".", maxsplit=1
+                )[0]
 
-                # Socket CPRO State
-                if self.entity_description.api_param in ("2501_3", "2502_3"):
-                    return POWER_STATES_DICT.get(prop[VALUE], "Unknown")
+            if self.entity_description.key == "uptime_hours":
+                return prop.value // 3600000
 
-                # Main CSM State
-                if self.entity_description.api_param in ("2501_1", "2502_1"):
-                    return MAIN_STATE_DICT.get(prop[VALUE], "Unknown")
-
-                # OCPP Boot notification
-                if self.entity_description.api_param == "3600_1":
-                    return OCPP_BOOT_NOTIFICATION_STATUS_DICT.get(
-                        prop[VALUE], "Unknown"
-                    )
-
-                # OCPP Boot notification
-                if self.entity_description.api_param == "2540_0":
-                    return MODBUS_CONNECTION_STATES_DICT.get(prop[VALUE], "Unknown")
-
-                # wallbox display message
-                if self.entity_description.api_param in ("3190_2", "3191_2"):
-                    return (
-                        str(prop[VALUE])
-                        + ": "
-                        + DISPLAY_ERROR_DICT.get(prop[VALUE], "Unknown")
-                    )
+            # change milliseconds to d/m/y HH:MM:SS
+            if self.entity_description.api_param in ("2187_0", "2059_0"):
+                return datetime.datetime.fromtimestamp(prop.value / 1000).strftime(
+                    "%d/%m/%Y %H:%M:%S"
+                )
 
-                # Status code
-                if self.entity_description.api_param in ("2501_2", "2502_2"):
-                    return STATUS_DICT.get(prop[VALUE], "Unknown")
+            # Allowed phase 1 or Allowed Phase 2
+            if (self.entity_description.api_param == "312E_0") | (
+                self.entity_description.api_param == "312F_0"
+            ):
+                return ALLOWED_PHASE_DICT.get(prop.value, "Unknown")
+
+            if self.entity_description.round_digits is not None:
+                return round(prop.value, self.entity_description.round_digits)
+
+            # mode3_state
+            if self.entity_description.api_param in ("2501_4", "2502_4"):
+                return MODE_3_STAT_DICT.get(prop.value, "Unknown")
+
+            # Socket CPRO State
+            if self.entity_description.api_param in ("2501_3", "2502_3"):
+                return POWER_STATES_DICT.get(prop.value, "Unknown")
+
+            # Main CSM State
+            if self.entity_description.api_param in ("2501_1", "2502_1"):
+                return MAIN_STATE_DICT.get(prop.value, "Unknown")
+
+            # OCPP Boot notification
+            if self.entity_description.api_param == "3600_1":
+                return OCPP_BOOT_NOTIFICATION_STATUS_DICT.get(prop.value, "Unknown")
+
+            # OCPP Boot notification
+            if self.entity_description.api_param == "2540_0":
+                return MODBUS_CONNECTION_STATES_DICT.get(prop.value, "Unknown")
+
+            # wallbox display message
+            if self.entity_description.api_param in ("3190_2", "3191_2"):
+                return (
+                    str(prop.value)
+                    + ": "
+                    + DISPLAY_ERROR_DICT.get(prop.value, "Unknown")
+                )
 
-                return prop[VALUE]
-        return None
+            # Status code
+            if self.entity_description.api_param in ("2501_2", "2502_2"):
+                return STATUS_DICT.get(prop.value, "Unknown")
 
-    @property
-    def extra_state_attributes(self):
-        """Return the default attributes of the element."""
-        for prop in self.coordinator.device.properties:
-            if prop[ID] == self.entity_description.api_param:
-                return {"category": prop[CAT]}
+            return prop.value
         return None
 
     @property
@@ -1986,7 +2005,7 @@ class AlfenSensor(AlfenEntity, SensorEntity):
 
     async def async_update(self):
         """Get the latest data and updates the states."""
-        self._async_update_attrs()
+        self._async_refresh_attrs()
 
     @property
     def device_info(self) -> DeviceInfo:
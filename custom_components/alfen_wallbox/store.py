@@ -0,0 +1,348 @@
+"""Property records for the Alfen Wallbox API."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from functools import cache
+from sys import intern
+from typing import Any
+
+from .const import (
+    ACCESS,
+    ACCESS_WRITE,
+    CAT,
+    ID,
+    LEN,
+    PROPERTY_HOT,
+    PROPERTY_SLOW,
+    PROPERTY_STATIC,
+    TYPE,
+    TYPE_FLOAT,
+    TYPE_INT,
+    TYPE_UINT64,
+    VALUE,
+)
+
+# weight of the last poll in the change rate of a property
+ACTIVITY_ALPHA = 0.02
+# below this change rate a property is static, from the hot rate on it is hot
+ACTIVITY_STATIC_RATE = 0.01
+ACTIVITY_HOT_RATE = 0.1
+
+VALUE_DECODERS: dict[int, Callable[[Any], Any]] = {
+    TYPE_INT: int,
+    TYPE_FLOAT: float,
+    TYPE_UINT64: int,
+}
+
+
+@cache
+def property_key(prop_id: str) -> int:
+    """Encode a property id like "2221_16" as an integer key.
+
+    The object index is stored in the upper bits and the subindex in the lower
+    16 bits, so all properties of one object share the same key >> 16.
+    """
+    index, _, subindex = prop_id.partition("_")
+    return int(index, 16) << 16 | int(subindex or "0", 16)
+
+
+def property_id(key: int) -> str:
+    """Decode an integer key back to the property id used by the API."""
+    return f"{key >> 16:04X}_{key & 0xFFFF:X}"
+
+
+def decode_value(prop_type: int, value: Any) -> Any:
+    """Convert a raw API value to the native type of the property."""
+    decoder = VALUE_DECODERS.get(prop_type)
+    if decoder is None or value is None:
+        return value
+    try:
+        return decoder(value)
+    except (TypeError, ValueError):
+        return value
+
+
+class AlfenPropertyMeta:
+    """Metadata of a property as reported by the API."""
+
+    __slots__ = ("access", "len", "type")
+
+    def __init__(self, access: int, prop_type: int, length: int) -> None:
+        """Initialize the property metadata."""
+        self.access = access
+        self.type = prop_type
+        self.len = length
+
+
+# Only a handful of access/type/len combinations exist, share one instance each
+_META_CACHE: dict[tuple[int, int, int], AlfenPropertyMeta] = {}
+
+
+def get_property_meta(access: int, prop_type: int, length: int) -> AlfenPropertyMeta:
+    """Return the shared metadata instance for the given combination."""
+    key = (access, prop_type, length)
+    meta = _META_CACHE.get(key)
+    if meta is None:
+        meta = _META_CACHE[key] = AlfenPropertyMeta(access, prop_type, length)
+    return meta
+
+
+class AlfenProperty:
+    """Compact representation of a single wallbox property."""
+
+    __slots__ = ("category", "generation", "id", "key", "meta", "value")
+
+    def __init__(
+        self,
+        prop_id: str,
+        category: str,
+        meta: AlfenPropertyMeta,
+        value: Any,
+        generation: int = 0,
+    ) -> None:
+        """Initialize the property."""
+        self.id = prop_id
+        self.key = property_key(prop_id)
+        self.category = category
+        self.meta = meta
+        self.value = value
+        self.generation = generation
+
+    @classmethod
+    def from_response(
+        cls, resp: dict, previous: AlfenProperty | None = None
+    ) -> AlfenProperty:
+        """Create a property from a decoded API response entry.
+
+        The previous record is returned as-is when nothing changed, records that
+        are already published are never modified by a poll. A new record gets its
+        generation when it is committed.
+        """
+        meta = get_property_meta(
+            resp.get(ACCESS, 0), resp.get(TYPE, 0), resp.get(LEN, 0)
+        )
+        value = decode_value(meta.type, resp[VALUE])
+        category = resp.get(CAT, "")
+        if (
+            previous is not None
+            and previous.meta is meta
+            and previous.category == category
+            and previous.value == value
+        ):
+            return previous
+        return cls(intern(resp[ID]), intern(category), meta, value)
+
+    def set_value(self, value: Any) -> None:
+        """Set a new value, decoded to the native type of the property."""
+        self.value = decode_value(self.meta.type, value)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the property in the API response format."""
+        return {
+            ID: self.id,
+            ACCESS: self.meta.access,
+            TYPE: self.meta.type,
+            LEN: self.meta.len,
+            CAT: self.category,
+            VALUE: self.value,
+        }
+
+
+class AlfenPropertyStore:
+    """Properties of a device, partitioned in one slice per category."""
+
+    def __init__(self) -> None:
+        """Initialize the store."""
+        self._slices: dict[str, dict[int, AlfenProperty]] = {}
+        self._index: dict[int, AlfenProperty] = {}
+        # increased with every commit or in place update of a property
+        self.generation = 0
+
+    def __contains__(self, key: int) -> bool:
+        """Return True if the property is known."""
+        return key in self._index
+
+    def __len__(self) -> int:
+        """Return the number of properties."""
+        return len(self._index)
+
+    def get(self, key: int) -> AlfenProperty | None:
+        """Return the property with the given key."""
+        return self._index.get(key)
+
+    def values(self) -> Iterable[AlfenProperty]:
+        """Return all properties."""
+        return self._index.values()
+
+    @property
+    def categories(self) -> Iterable[str]:
+        """Return the categories with a slice in the store."""
+        return self._slices.keys()
+
+    def get_slice(self, category: str) -> dict[int, AlfenProperty]:
+        """Return the properties of a category."""
+        return self._slices.get(category, {})
+
+    def touch(self, prop: AlfenProperty) -> None:
+        """Mark a property that was updated in place as changed."""
+        self.generation += 1
+        prop.generation = self.generation
+
+    def commit(
+        self,
+        slices: dict[str, dict[int, AlfenProperty]],
+        updates: dict[str, dict[int, AlfenProperty]] | None = None,
+    ) -> set[int]:
+        """Replace the slices and apply the updates of categories in one step.
+
+        A slice replaces its whole category, an update only the records it holds.
+        The records that are new get the generation of the commit, stamped here
+        so a record touched while the slices were staged is always older.
+        Return the keys of the properties that were removed.
+        """
+        self.generation += 1
+        removed: set[int] = set()
+        for category, properties in slices.items():
+            for key in self._slices.get(category, {}).keys() - properties.keys():
+                # the property can have moved to a category committed before
+                prop = self._index.get(key)
+                if prop is not None and prop.category == category:
+                    del self._index[key]
+                    removed.add(key)
+            self._add(properties)
+            self._slices[category] = properties
+        for category, properties in (updates or {}).items():
+            self._add(properties)
+            self._slices.setdefault(category, {}).update(properties)
+        return removed - self._index.keys()
+
+    def _add(self, properties: dict[int, AlfenProperty]) -> None:
+        """Index the records of a commit.
+
+        A record that moved to another category leaves the slice it was in.
+        """
+        for key, prop in properties.items():
+            previous = self._index.get(key)
+            if previous is prop:
+                continue
+            prop.generation = self.generation
+            if previous is not None and previous.category != prop.category:
+                self._slices.get(previous.category, {}).pop(key, None)
+            self._index[key] = prop
+
+
+class AlfenPropertyCatalog:
+    """Metadata of every property seen on one firmware version."""
+
+    def __init__(self, firmware_version: str | None = None) -> None:
+        """Initialize the catalog."""
+        self.firmware_version = firmware_version
+        self._entries: dict[int, tuple[str, AlfenPropertyMeta]] = {}
+        # set when the catalog has entries that are not persisted yet
+        self.dirty = False
+
+    def get(self, key: int) -> AlfenPropertyMeta | None:
+        """Return the metadata of a property."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        return entry[1]
+
+    def add(self, prop: AlfenProperty) -> None:
+        """Record the category and metadata of a property."""
+        entry = self._entries.get(prop.key)
+        if entry is None or entry[0] != prop.category or entry[1] is not prop.meta:
+            self._entries[prop.key] = (prop.category, prop.meta)
+            self.dirty = True
+
+    def is_writable(self, key: int) -> bool | None:
+        """Return if a property is writable, None if it was never seen."""
+        meta = self.get(key)
+        if meta is None:
+            return None
+        return bool(meta.access & ACCESS_WRITE)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the catalog in a JSON serializable format."""
+        return {
+            "firmware_version": self.firmware_version,
+            "properties": {
+                property_id(key): {
+                    CAT: category,
+                    ACCESS: meta.access,
+                    TYPE: meta.type,
+                    LEN: meta.len,
+                }
+                for key, (category, meta) in sorted(self._entries.items())
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> AlfenPropertyCatalog:
+        """Create a catalog from the output of as_dict."""
+        catalog = cls(data.get("firmware_version"))
+        for prop_id, entry in data.get("properties", {}).items():
+            catalog._entries[property_key(prop_id)] = (
+                intern(entry.get(CAT, "")),
+                get_property_meta(
+                    entry.get(ACCESS, 0), entry.get(TYPE, 0), entry.get(LEN, 0)
+                ),
+            )
+        return catalog
+
+
+class AlfenPropertyActivity:
+    """Change rate of the properties, learned over the polls.
+
+    The rate is an exponential moving average of the polls in which the value
+    changed. Properties start as hot, without changes they become static after
+    a few hundred polls.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the activity."""
+        self._rates: dict[int, float] = {}
+        self._classes: dict[int, str] = {}
+        # increased when a property changes class
+        self.version = 0
+
+    def observe(self, key: int, changed: bool) -> None:
+        """Record if the value of a property changed in a poll."""
+        rate = self._rates.get(key, 1.0)
+        self._set_rate(key, rate + ACTIVITY_ALPHA * (changed - rate))
+
+    def _set_rate(self, key: int, rate: float) -> None:
+        """Set the change rate of a property and update its class."""
+        self._rates[key] = rate
+        if rate < ACTIVITY_STATIC_RATE:
+            property_class = PROPERTY_STATIC
+        elif rate < ACTIVITY_HOT_RATE:
+            property_class = PROPERTY_SLOW
+        else:
+            property_class = PROPERTY_HOT
+        if self._classes.get(key, PROPERTY_HOT) != property_class:
+            self._classes[key] = property_class
+            self.version += 1
+
+    def get_class(self, key: int) -> str:
+        """Return the class of a property, hot when it was never observed."""
+        return self._classes.get(key, PROPERTY_HOT)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the change rates in a JSON serializable format."""
+        return {
+            "rates": {
+                property_id(key): round(rate, 6)
+                for key, rate in sorted(self._rates.items())
+            }
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> AlfenPropertyActivity:
+        """Create the activity from the output of as_dict."""
+        activity = cls()
+        for prop_id, rate in data.get("rates", {}).items():
+            activity._set_rate(property_key(prop_id), rate)
+        activity.version = 0
+        return activity
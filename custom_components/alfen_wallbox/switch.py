@@ -4,16 +4,13 @@ from dataclasses import dataclass
 from typing import Any, Final
 
 from homeassistant.components.switch import SwitchEntity, SwitchEntityDescription
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import entity_platform
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import (
-    CAT,
-    ID,
     SERVICE_DISABLE_PHASE_SWITCHING,
     SERVICE_ENABLE_PHASE_SWITCHING,
-    VALUE,
 )
 from .coordinator import AlfenConfigEntry
 from .entity import AlfenEntity
@@ -118,36 +115,24 @@ class AlfenSwitchSensor(AlfenEntity, SwitchEntity):
         self, entry: AlfenConfigEntry, description: AlfenSwitchDescription
     ) -> None:
         """Initialize."""
-        super().__init__(entry)
+        super().__init__(entry, description)
 
         self._attr_name = f"{self.coordinator.device.name} {description.name}"
         self._attr_unique_id = f"{self.coordinator.device.id}_{description.key}"
-        self.entity_description = description
+        self._async_refresh_attrs()
+
+    @callback
+    def _async_update_attrs(self) -> None:
+        """Update the switch attributes."""
+        prop = self.coordinator.device.properties.get(self._api_key)
+        self._attr_available = prop is not None
+        self._attr_is_on = prop.value == 1 or 3 if prop is not None else False
+        self._attr_extra_state_attributes = self._get_property_attributes(prop)
 
     @property
     def available(self) -> bool:
         """Return True if entity is available."""
-        for prop in self.coordinator.device.properties:
-            if prop[ID] == self.entity_description.api_param:
-                return True
-        return False
-
-    @property
-    def is_on(self) -> bool:
-        """Return True if entity is on."""
-        for prop in self.coordinator.device.properties:
-            if prop[ID] == self.entity_description.api_param:
-                return prop[VALUE] == 1 or 3
-
-        return False
-
-    @property
-    def extra_state_attributes(self):
-        """Return the default attributes of the element."""
-        for prop in self.coordinator.device.properties:
-            if prop[ID] == self.entity_description.api_param:
-                return {"category": prop[CAT]}
-        return None
+        return self._attr_available and not self._expired
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the light on."""
@@ -5,12 +5,10 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Final
 
-from homeassistant.components.counter import VALUE
 from homeassistant.components.text import TextEntity, TextEntityDescription, TextMode
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import CAT, ID
 from .coordinator import AlfenConfigEntry
 from .entity import AlfenEntity
 
@@ -87,24 +85,25 @@ class AlfenText(AlfenEntity, TextEntity):
         self, entry: AlfenConfigEntry, description: AlfenTextDescription
     ) -> None:
         """Initialize the Alfen text entity."""
-        super().__init__(entry)
+        super().__init__(entry, description)
 
         self._attr_name = f"{self.coordinator.device.name} {description.name}"
         self._attr_mode = description.mode
         self._attr_unique_id = f"{self.coordinator.device.id}_{description.key}"
-        self.entity_description = description
-        self._async_update_attrs()
+        self._async_refresh_attrs()
 
     @callback
     def _async_update_attrs(self) -> None:
         """Update text attributes."""
         self._attr_native_value = self._get_current_value()
+        prop = self.coordinator.device.properties.get(self._api_key)
+        self._attr_extra_state_attributes = self._get_property_attributes(prop)
 
     def _get_current_value(self) -> str | None:
         """Return the current value."""
-        for prop in self.coordinator.device.properties:
-            if prop[ID] == self.entity_description.api_param:
-                return prop[VALUE]
+        prop = self.coordinator.device.properties.get(self._api_key)
+        if prop is not None:
+            return prop.value
         return None
 
     async def async_set_value(self, value: str) -> None:
@@ -113,12 +112,5 @@ class AlfenText(AlfenEntity, TextEntity):
         await self.coordinator.device.set_value(
             self.entity_description.api_param, value
         )
+        self._async_refresh_attrs()
         self.async_write_ha_state()
-
-    @property
-    def extra_state_attributes(self):
-        """Return the default attributes of the element."""
-        for prop in self.coordinator.device.properties:
-            if prop[ID] == self.entity_description.api_param:
-                return {"category": prop[CAT]}
-        return None
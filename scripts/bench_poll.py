@@ -0,0 +1,103 @@
+"""Measure the CPU time of a poll with and without the property index.
+
+Before the index the properties were a list of API response dicts that every
+entity scanned for its id, that baseline is reproduced here. After it a poll
+builds AlfenProperty records and commits them to the AlfenPropertyStore, the
+entities look their property up by key.
+
+    python scripts/bench_poll.py [--properties 450] [--entities 150]
+"""
+
+import argparse
+import random
+import time
+
+from integration import load
+
+store = load("store")
+const = load("const")
+
+# an entity reads its property for the state, the attributes and availability
+READS_PER_ENTITY = 3
+CATEGORIES = ("generic", "meter1", "states", "temp")
+
+
+def make_response(count: int, poll: int) -> list[dict]:
+    """Return the properties of a poll as the API reports them."""
+    return [
+        {
+            const.ID: f"{0x2000 + index // 3:04X}_{index % 3:X}",
+            const.ACCESS: 1,
+            const.TYPE: const.TYPE_FLOAT,
+            const.LEN: 0,
+            const.CAT: CATEGORIES[index % len(CATEGORIES)],
+            const.VALUE: float(index + poll * (index % 2)),
+        }
+        for index in range(count)
+    ]
+
+
+def poll_before(responses: list[dict], entity_ids: list[str]) -> None:
+    """Replace the property list and let every entity scan it."""
+    properties = list(responses)
+    for prop_id in entity_ids:
+        for _ in range(READS_PER_ENTITY):
+            for prop in properties:
+                if prop[const.ID] == prop_id:
+                    break
+
+
+def poll_after(
+    properties: store.AlfenPropertyStore, responses: list[dict], entity_keys: list[int]
+) -> None:
+    """Commit the records to the store and let every entity look up its key."""
+    slices: dict[str, dict[int, store.AlfenProperty]] = {}
+    for resp in responses:
+        previous = properties.get(store.property_key(resp[const.ID]))
+        prop = store.AlfenProperty.from_response(resp, previous)
+        slices.setdefault(prop.category, {})[prop.key] = prop
+    properties.commit(slices)
+    for key in entity_keys:
+        for _ in range(READS_PER_ENTITY):
+            properties.get(key)
+
+
+def measure(poll, polls: int) -> float:
+    """Return the CPU milliseconds of one poll, the best of a few runs."""
+    best = float("inf")
+    for _ in range(5):
+        start = time.process_time()
+        for index in range(polls):
+            poll(index)
+        best = min(best, (time.process_time() - start) / polls)
+    return best * 1000
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--properties", type=int, default=450)
+    parser.add_argument("--entities", type=int, default=150)
+    parser.add_argument("--polls", type=int, default=50)
+    args = parser.parse_args()
+
+    responses = [make_response(args.properties, poll) for poll in range(args.polls)]
+    random.seed(1)
+    entity_ids = [random.choice(responses[0])[const.ID] for _ in range(args.entities)]
+    entity_keys = [store.property_key(prop_id) for prop_id in entity_ids]
+    properties = store.AlfenPropertyStore()
+
+    before = measure(lambda poll: poll_before(responses[poll], entity_ids), args.polls)
+    after = measure(
+        lambda poll: poll_after(properties, responses[poll], entity_keys), args.polls
+    )
+    print(
+        f"{args.properties} properties, {args.entities} entities, "
+        f"{READS_PER_ENTITY} reads per entity"
+    )
+    print(f"before (linear scan)  {before:7.3f} ms/poll")
+    print(f"after  (store index)  {after:7.3f} ms/poll")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""Check that AlfenSSLContext resumes the TLS sessions of the wallbox.
+
+A local stand-in for the wallbox API closes the connection after every
+response, like the wallbox does with idle connections, and counts the full
+and the resumed handshakes. A few polls are run with a plain SSL context and
+with AlfenSSLContext, for TLS 1.2 and 1.3. The check fails when
+AlfenSSLContext did not resume the sessions.
+
+Needs aiohttp and the openssl command for the self-signed certificate.
+
+    python scripts/check_tls_resumption.py [--polls 3]
+"""
+
+import argparse
+import asyncio
+import json
+from pathlib import Path
+import ssl
+import subprocess
+import sys
+import tempfile
+
+from aiohttp import web
+from integration import load
+
+alfen = load("alfen")
+connection = load("connection")
+
+CATEGORIES = ("generic", "meter1", "states")
+PAGE_SIZE = 32
+
+
+def make_properties() -> dict[str, dict]:
+    """Return the properties of the stand-in, a few pages per category."""
+    properties = {}
+    for index, category in enumerate(CATEGORIES):
+        for subindex in range(80):
+            prop_id = f"{0x2100 + index:04X}_{subindex:X}"
+            properties[prop_id] = {
+                "id": prop_id,
+                "access": 1,
+                "type": 8,
+                "len": 0,
+                "cat": category,
+                "value": float(subindex),
+            }
+    return properties
+
+
+class WallboxStandIn:
+    """Serve the API of the wallbox and count the TLS handshakes."""
+
+    def __init__(self, maximum_version: ssl.TLSVersion, certfile: Path) -> None:
+        """Initialize the stand-in."""
+        self.properties = make_properties()
+        self.full = 0
+        self.resumed = 0
+        self.context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+        self.context.load_cert_chain(certfile)
+        self.context.maximum_version = maximum_version
+        self._runner: web.AppRunner | None = None
+
+    async def start(self) -> int:
+        """Start the server and return its port."""
+        app = web.Application(middlewares=[self._count_handshake])
+        app.router.add_get("/api/info", self._info)
+        app.router.add_post("/api/login", self._empty)
+        app.router.add_post("/api/logout", self._empty)
+        app.router.add_get("/api/prop", self._prop)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0, ssl_context=self.context)
+        await site.start()
+        return self._runner.addresses[0][1]
+
+    async def stop(self) -> None:
+        """Stop the server."""
+        await self._runner.cleanup()
+
+    @web.middleware
+    async def _count_handshake(self, request: web.Request, handler):
+        """Count the handshake of the connection and close it after the response."""
+        # every connection serves one request, so every request is a handshake
+        if request.transport.get_extra_info("ssl_object").session_reused:
+            self.resumed += 1
+        else:
+            self.full += 1
+        response = await handler(request)
+        response.force_close()
+        return response
+
+    async def _info(self, request: web.Request) -> web.Response:
+        """Return the device info."""
+        return web.json_response(
+            {
+                "Identity": "ACE0000000",
+                "FWVersion": "6.4.0",
+                "Model": "NG910-60023",
+                "ObjectId": "0",
+                "Type": "0",
+            }
+        )
+
+    async def _empty(self, request: web.Request) -> web.Response:
+        """Accept a login or logout."""
+        return web.json_response({})
+
+    async def _prop(self, request: web.Request) -> web.Response:
+        """Return a page of a category or the requested ids."""
+        if "ids" in request.query:
+            ids = request.query["ids"].split(",")
+            properties = [self.properties[i] for i in ids if i in self.properties]
+            offset = 0
+            total = len(properties)
+        else:
+            category = request.query["cat"]
+            offset = int(request.query.get("offset", 0))
+            matches = [p for p in self.properties.values() if p["cat"] == category]
+            properties = matches[offset : offset + PAGE_SIZE]
+            total = len(matches)
+        return web.Response(
+            text=json.dumps(
+                {
+                    "version": 2,
+                    "properties": properties,
+                    "offset": offset,
+                    "total": total,
+                }
+            ),
+            content_type="application/json",
+        )
+
+
+def create_plain_context() -> ssl.SSLContext:
+    """Return a context like create_ssl_context, without session resumption."""
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+    context.set_ciphers("DEFAULT")
+    context.check_hostname = False
+    context.verify_mode = ssl.CERT_NONE
+    return context
+
+
+async def run(
+    context: ssl.SSLContext,
+    maximum_version: ssl.TLSVersion,
+    certfile: Path,
+    polls: int,
+) -> WallboxStandIn:
+    """Poll the stand-in with the given client context."""
+    stand_in = WallboxStandIn(maximum_version, certfile)
+    port = await stand_in.start()
+    stats = connection.AlfenConnectionStats()
+    session = connection.create_session(context, stats, 10)
+    device = alfen.AlfenDevice(
+        session, f"127.0.0.1:{port}", "wallbox", "admin", "admin", CATEGORIES, context
+    )
+    try:
+        await device.init()
+        for _ in range(polls):
+            await device.async_update()
+    finally:
+        await session.close()
+        await stand_in.stop()
+    return stand_in
+
+
+def create_certificate(directory: Path) -> Path:
+    """Create a self-signed certificate with its key in one file."""
+    certfile = directory / "wallbox.pem"
+    subprocess.run(
+        [
+            "openssl",
+            "req",
+            "-x509",
+            "-newkey",
+            "rsa:2048",
+            "-nodes",
+            "-days",
+            "1",
+            "-subj",
+            "/CN=wallbox",
+            "-keyout",
+            str(certfile),
+            "-out",
+            str(certfile),
+        ],
+        check=True,
+        capture_output=True,
+    )
+    return certfile
+
+
+def main() -> int:
+    """Run the check."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--polls", type=int, default=3)
+    args = parser.parse_args()
+
+    passed = True
+    with tempfile.TemporaryDirectory() as directory:
+        certfile = create_certificate(Path(directory))
+        for version in (ssl.TLSVersion.TLSv1_2, ssl.TLSVersion.TLSv1_3):
+            for label, context in (
+                ("plain SSLContext", create_plain_context()),
+                ("AlfenSSLContext", connection.create_ssl_context()),
+            ):
+                stand_in = asyncio.run(run(context, version, certfile, args.polls))
+                print(
+                    f"{version.name:8} {label:17} "
+                    f"full {stand_in.full:4}  resumed {stand_in.resumed:4}"
+                )
+                if isinstance(context, connection.AlfenSSLContext):
+                    passed &= stand_in.resumed > 0 and stand_in.full == 1
+    print("resumption works" if passed else "resumption FAILED")
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,23 @@
+"""Import the modules of the integration without Home Assistant.
+
+The package __init__ sets up the config entries and needs Home Assistant.
+The scripts only use the modules that talk to the wallbox, so the package
+is registered without running its __init__.
+"""
+
+from importlib import import_module
+from pathlib import Path
+import sys
+from types import ModuleType
+
+PACKAGE = "alfen_wallbox"
+PACKAGE_PATH = Path(__file__).resolve().parent.parent / "custom_components" / PACKAGE
+
+
+def load(name: str) -> ModuleType:
+    """Return a module of the integration, like load("store")."""
+    if PACKAGE not in sys.modules:
+        package = ModuleType(PACKAGE)
+        package.__path__ = [str(PACKAGE_PATH)]
+        sys.modules[PACKAGE] = package
+    return import_module(f"{PACKAGE}.{name}")